@@ -33,7 +33,7 @@ _install_default_translator()
 
 
 from .activation import Activation
-from .attribute import Attribute
+from .attribute import ADVANTAGE_MATRIX, Attribute
 from .card import Card
 from .data import CardData, HeroData, StageData
 from .hero import Hero
@@ -0,0 +1,115 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+import sys
+from argparse import ArgumentParser, Namespace
+
+from .atlas import _kinds, build_atlas
+from .batch import render_cards
+from .data import CardData
+from .path import path
+from .thumbnail import build_thumbnails
+from .update import update_data
+
+
+def atlas(args: Namespace) -> None:
+    kinds = tuple(args.kinds) or _kinds
+    print(f"{build_atlas(kinds, force=args.force)} images stored in the atlas.")
+
+
+def batch(args: Namespace) -> None:
+    cards = CardData()
+    if args.cards:
+        cards = CardData([card for card in cards if card.num in args.cards])
+
+    def progress(done: int, total: int) -> None:
+        print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    result = render_cards(cards, args.outdir, args.levels, args.locales,
+                          args.processes, progress)
+    print(file=sys.stderr)
+    for name, error in result.errors.items():
+        print(f"{name}: {type(error).__name__}: {error}", file=sys.stderr)
+    print(result)
+    if result.errors:
+        sys.exit(1)
+
+
+def thumbnail(args: Namespace) -> None:
+    kinds = tuple(args.kinds) or _kinds
+    print(f"{build_thumbnails(kinds, args.force)} thumbnails generated.")
+
+
+def update(args: Namespace) -> None:
+    result = update_data(args.zipfile, args.directory, args.remove, args.verify)
+    for status, names in zip("AMD", (result.added, result.modified, result.removed)):
+        for name in names:
+            print(f"{status}\t{name}")
+    print(result, file=sys.stderr)
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="python -m compass")
+    subparsers = parser.add_subparsers(required=True)
+
+    sub = subparsers.add_parser("batch", help="render card detail images")
+    sub.add_argument("outdir", help="directory to save images to")
+    sub.add_argument("-c", "--cards", nargs="+", type=int, metavar="NUM",
+                     help="numbers of cards to render (default: all)")
+    sub.add_argument("-l", "--levels", nargs="+", type=int, default=[50],
+                     help="levels of cards (default: 50)")
+    sub.add_argument("-L", "--locales", nargs="+", default=["ja"],
+                     help="locales of images (default: ja)")
+    sub.add_argument("-j", "--processes", type=int,
+                     help="number of worker processes (default: number of CPUs)")
+    sub.set_defaults(func=batch)
+
+    sub = subparsers.add_parser("thumbnail", help="generate thumbnails of images")
+    sub.add_argument("kinds", nargs="*", metavar="kind",
+                     help=f"kinds of images, {', '.join(_kinds)} (default: all)")
+    sub.add_argument("--force", action="store_true", help="regenerate all thumbnails")
+    sub.set_defaults(func=thumbnail)
+
+    sub = subparsers.add_parser("atlas", help="build the atlas of raw images")
+    sub.add_argument("kinds", nargs="*", metavar="kind",
+                     help=f"kinds of images, {', '.join(_kinds)} (default: all)")
+    sub.add_argument("--force", action="store_true", help="rebuild an up-to-date atlas")
+    sub.set_defaults(func=atlas)
+
+    sub = subparsers.add_parser("update", help="install changed files of a release of compass data")
+    sub.add_argument("zipfile", help="zip archive of the release")
+    sub.add_argument("-d", "--directory", default=path.cps_dir,
+                     help="directory the data is installed in (default: compass/compass-data)")
+    sub.add_argument("--remove", action="store_true",
+                     help="remove files no longer in the release")
+    sub.add_argument("--verify", action="store_true",
+                     help="compute checksums of installed files instead of trusting the manifest")
+    sub.set_defaults(func=update)
+
+    args = parser.parse_args()
+    if any(kind not in _kinds for kind in getattr(args, "kinds", [])):
+        parser.error(f"kinds must be {', '.join(_kinds)}")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
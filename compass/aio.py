@@ -0,0 +1,230 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "Renderer",
+    "agenerate_deck",
+    "agenerate_image",
+    "agenerate_image_bytes",
+    "renderer",
+)
+
+
+import asyncio
+import os
+from concurrent.futures import Executor
+from functools import lru_cache, partial
+from inspect import Signature, signature
+from typing import Any, Hashable
+from weakref import WeakKeyDictionary
+
+from PIL.Image import Image
+from PIL.PngImagePlugin import PngImageFile
+
+from .cache import _digest, _freeze
+from .card import Card
+from .data import CardData
+from .stage import Stage
+
+
+@lru_cache(maxsize=None)
+def _signature(cls: type, name: str) -> Signature:
+    return signature(getattr(cls, name))
+
+
+def _call(obj: Any, name: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+    """Calls the method in a worker. Defined at module level to be picklable."""
+    return getattr(obj, name)(*args, **kwargs)
+
+
+class Renderer(object):
+    """Runs ``generate_*`` methods in an executor without blocking the event loop.
+
+    At most ``concurrency`` renders run at the same time. Identical requests
+    (the same method, record data and arguments) in flight are coalesced
+    into one render, whose result every caller receives. A render is
+    cancelled once all of its callers are cancelled, but its slot is only
+    freed when the executor finishes it. A renderer may be used from
+    several event loops, each of which has its own limit.
+    """
+
+    def __init__(self, executor: Executor | None = None,
+                 concurrency: int | None = None) -> None:
+        """Creates a renderer.
+
+        Parameters
+        ----------
+        executor: Optional[:class:`concurrent.futures.Executor`]
+            Thread or process pool to render in. If omitted, the default
+            executor of the event loop is used. Each worker of a process
+            pool keeps its own font and image caches.
+        concurrency: Optional[:class:`int`]
+            The maximum number of renders running at the same time.
+            If omitted, the number of CPUs.
+
+        """
+
+        self.executor = executor
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self._loops: WeakKeyDictionary[asyncio.AbstractEventLoop,
+                                       tuple[asyncio.Semaphore, dict[Hashable, list]]] \
+            = WeakKeyDictionary()
+
+    def _state(self) -> tuple[asyncio.Semaphore, dict[Hashable, list[asyncio.Task | int]]]:
+        """The semaphore and renders in flight of the running event loop."""
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = self._loops[loop] = (asyncio.Semaphore(self.concurrency), {})
+        return state
+
+    def _key(self, obj: Any, name: str, args: tuple, kwargs: dict[str, Any]) -> Hashable:
+        bound = _signature(type(obj), name).bind(obj, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((key, _freeze(value)) for key, value
+                          in list(bound.arguments.items())[1:])
+        return (type(obj).__qualname__, name, _digest(obj), arguments)
+
+    async def _render(self, obj: Any, name: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        semaphore, _ = self._state()
+        await semaphore.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, partial(_call, obj, name, args, kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        # a cancelled render keeps running in the executor, so keep its slot until it ends
+        future.add_done_callback(lambda _: semaphore.release())
+        return await asyncio.shield(future)
+
+    async def run(self, obj: Any, name: str, *args, **kwargs) -> Any:
+        """Calls the method of the object in the executor.
+
+        Parameters
+        ----------
+        obj: Any
+            Object to call the method of, e.g. :class:`compass.Card`.
+        name: :class:`str`
+            Name of the method, e.g. ``generate_image``.
+        *args
+            Positional arguments of the method.
+        **kwargs
+            Keyword arguments of the method.
+
+        Returns
+        -------
+        Any
+            Returned value of the method. Images are copied for each caller,
+            so modifying a returned image never affects the others.
+
+        """
+
+        key = self._key(obj, name, args, kwargs)
+        _, inflight = self._state()
+        entry = inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._render(obj, name, args, kwargs))
+            entry = inflight[key] = [task, 0]
+
+            def done(_: asyncio.Task) -> None:
+                if inflight.get(key) is entry:
+                    del inflight[key]
+            task.add_done_callback(done)
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            retval = await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+
+        return retval.copy() if isinstance(retval, Image) else retval
+
+
+renderer = Renderer()
+
+
+async def agenerate_image(obj: Card | CardData | Stage, *args, **kwargs) -> PngImageFile:
+    """Awaitable version of ``generate_image`` rendered by :data:`renderer`.
+
+    Parameters
+    ----------
+    obj: Union[:class:`compass.Card`, :class:`compass.CardData`, :class:`compass.Stage`]
+        Object to generate the image of.
+    *args
+        Positional arguments of ``generate_image``.
+    **kwargs
+        Keyword arguments of ``generate_image``.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Generated image object.
+
+    """
+    return await renderer.run(obj, "generate_image", *args, **kwargs)
+
+
+async def agenerate_image_bytes(obj: Card | CardData | Stage, *args, **kwargs) -> bytes:
+    """Awaitable version of ``generate_image_bytes`` rendered by :data:`renderer`.
+
+    Parameters
+    ----------
+    obj: Union[:class:`compass.Card`, :class:`compass.CardData`, :class:`compass.Stage`]
+        Object to generate the image of.
+    *args
+        Positional arguments of ``generate_image_bytes``.
+    **kwargs
+        Keyword arguments of ``generate_image_bytes``.
+
+    Returns
+    -------
+    :class:`bytes`
+        Encoded image.
+
+    """
+    return await renderer.run(obj, "generate_image_bytes", *args, **kwargs)
+
+
+async def agenerate_deck(cards: CardData, levels: list[int] | None = [50]*4,
+                         locale: str = "ja") -> PngImageFile:
+    """Awaitable version of :meth:`compass.CardData.generate_deck`.
+
+    Parameters
+    ----------
+    cards: :class:`compass.CardData`
+        Cards in the deck.
+    levels: Optional[List[int]]
+        Cards' level.
+    locale: :class:`str`
+        If a corresponding image is available, it is used.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Generated image object.
+
+    """
+    return await renderer.run(cards, "generate_deck", levels, locale)
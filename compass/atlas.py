@@ -0,0 +1,287 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "Atlas",
+    "atlas_version",
+    "build_atlas",
+    "disable_atlas",
+    "enable_atlas",
+    "image_size",
+    "load_image",
+)
+
+
+import hashlib
+import json
+import mmap
+import os
+from glob import glob
+from os.path import basename, splitext
+from tempfile import mkstemp
+from typing import Literal
+
+from PIL import Image
+from PIL.PngImagePlugin import PngImageFile
+
+from .path import path
+from .utils import _file_digest
+
+
+Kind = Literal["card", "hero", "icon", "stage"]
+
+_kinds: tuple[Kind, ...] = ("card", "hero", "icon", "stage",)
+
+
+def _version(digests: dict[str, dict[str, str]]) -> str:
+    """Obtains the version of an atlas from the digests of its source images."""
+    data = json.dumps(digests, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def _source_digests(kinds: tuple[Kind, ...]) -> dict[str, dict[str, str]]:
+    digests: dict[str, dict[str, str]] = {}
+    for kind in kinds:
+        files = sorted(glob(f"{path.cps_imgdir}/{kind}/*.png"))
+        nums = list(map(lambda file: int(splitext(basename(file))[0]), files))
+        digests[kind] = {str(num): _file_digest(path.img(kind, num)) for num in nums}
+    return digests
+
+
+class Atlas(object):
+    """Images stored as raw ``RGBA`` in one memory-mapped file.
+
+    Images are obtained without decoding or copying; they are read-only views
+    of the mapped file, whose pages are shared by all processes on the host
+    through the page cache. ``PIL`` copies an image before modifying it.
+    """
+
+    def __init__(self, fp: str = path.atlas, index: str = path.atlas_index,
+                 verify: bool = True) -> None:
+        """Opens the atlas.
+
+        Parameters
+        ----------
+        fp: :class:`str`
+            Path to the atlas.
+        index: :class:`str`
+            Path to the index of the atlas.
+        verify: :class:`bool`
+            Whether or not to compare the digests of the source images with
+            those the atlas was built from. Images whose source has changed
+            or been removed are not obtained from the atlas.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the index was written by an older version of
+            :func:`build_atlas`.
+
+        """
+
+        with open(index, "r") as f:
+            index_: dict = json.load(f)
+        if "version" not in index_:
+            raise RuntimeError("The atlas is outdated. Rebuild it by `python -m compass atlas`.")
+        self.version: str = index_["version"]
+        self._index: dict[str, dict[str, list]] = index_["images"]
+
+        if verify:
+            for kind, entries in self._index.items():
+                for num in list(entries):
+                    try:
+                        digest = _file_digest(path.img(kind, int(num)))
+                    except FileNotFoundError:
+                        digest = None
+                    if entries[num][3] != digest:
+                        del entries[num]
+
+        with open(fp, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+    def size(self, kind: Kind, num: int) -> tuple[int, int] | None:
+        """Obtains the size of the image, or ``None`` if the atlas does not contain it."""
+        entry = self._index.get(kind, {}).get(str(num))
+        return None if entry is None else (entry[1], entry[2])
+
+    def get(self, kind: Kind, num: int) -> PngImageFile | None:
+        """Obtains the image, or ``None`` if the atlas does not contain it."""
+        entry = self._index.get(kind, {}).get(str(num))
+        if entry is None:
+            return None
+        offset, width, height, _ = entry
+        data = self._buffer[offset:offset + width*height*4]
+        return Image.frombuffer("RGBA", (width, height), data, "raw", "RGBA", 0, 1)
+
+
+_atlas: Atlas | None = None
+
+
+def enable_atlas(fp: str = path.atlas, index: str = path.atlas_index,
+                 verify: bool = True) -> None:
+    """Obtains images from the atlas built by :func:`build_atlas`.
+
+    Parameters
+    ----------
+    fp: :class:`str`
+        Path to the atlas.
+    index: :class:`str`
+        Path to the index of the atlas.
+    verify: :class:`bool`
+        Whether or not to skip images whose source has changed since the
+        atlas was built. See :class:`Atlas`.
+
+    """
+
+    global _atlas
+    _atlas = Atlas(fp, index, verify)
+
+
+def atlas_version() -> str | None:
+    """Obtains the version of the enabled atlas, or ``None`` if disabled.
+
+    The version is a digest of the source images the atlas was built from.
+    """
+    return None if _atlas is None else _atlas.version
+
+
+def disable_atlas() -> None:
+    """Obtains images by decoding image files again."""
+    global _atlas
+    _atlas = None
+
+
+def load_image(kind: Kind, num: int) -> PngImageFile:
+    """Obtains the original image from the atlas if enabled, else from the file.
+
+    Parameters
+    ----------
+    kind: :class:`str`
+        Kind of the image, ``card``, ``hero``, ``icon`` or ``stage``.
+    num: :class:`int`
+        The number (ID for stages) of the image.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Image converted to ``RGBA``.
+
+    """
+
+    if _atlas is not None:
+        img = _atlas.get(kind, num)
+        if img is not None:
+            return img
+    return Image.open(path.img(kind, num)).convert("RGBA")
+
+
+def image_size(kind: Kind, num: int) -> tuple[int, int]:
+    """Obtains the size of the original image without decoding it.
+
+    The size is read from the atlas if enabled, else from the header of the file.
+
+    Parameters
+    ----------
+    kind: :class:`str`
+        Kind of the image, ``card``, ``hero``, ``icon`` or ``stage``.
+    num: :class:`int`
+        The number (ID for stages) of the image.
+
+    Returns
+    -------
+    Tuple[:class:`int`, :class:`int`]
+        Width and height of the image.
+
+    """
+
+    if _atlas is not None:
+        size = _atlas.size(kind, num)
+        if size is not None:
+            return size
+    with Image.open(path.img(kind, num)) as img: # reads only the header
+        return img.size
+
+
+def build_atlas(kinds: tuple[Kind, ...] = _kinds,
+                fp: str = path.atlas, index: str = path.atlas_index,
+                force: bool = False) -> int:
+    """Builds the atlas of card, hero, icon and stage images.
+
+    The digest of every source image is recorded in the index, and the
+    atlas is not rebuilt if none of them has changed. The atlas and its
+    index are written to temporary files and then replaced, so processes
+    using the old atlas are not affected.
+
+    Parameters
+    ----------
+    kinds: Tuple[:class:`str`, ...]
+        Kinds of the images to store.
+    fp: :class:`str`
+        Path to the atlas.
+    index: :class:`str`
+        Path to the index of the atlas.
+    force: :class:`bool`
+        Whether or not to rebuild an up-to-date atlas.
+
+    Returns
+    -------
+    :class:`int`
+        The number of stored images, or 0 if the atlas is up to date.
+
+    """
+
+    digests = _source_digests(kinds)
+    version = _version(digests)
+
+    if not force and os.path.exists(fp):
+        try:
+            with open(index, "r") as f:
+                if json.load(f).get("version") == version:
+                    return 0
+        except (FileNotFoundError, ValueError):
+            pass
+
+    entries: dict[str, dict[str, list]] = {}
+    offset = 0
+
+    fd, tmp = mkstemp(dir=os.path.dirname(fp), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        for kind in kinds:
+            entries[kind] = {}
+            for num, digest in digests[kind].items():
+                with Image.open(path.img(kind, int(num))) as img:
+                    data = img.convert("RGBA").tobytes()
+                    entries[kind][num] = [offset, img.width, img.height, digest]
+                f.write(data)
+                offset += len(data)
+
+    fd, tmp_index = mkstemp(dir=os.path.dirname(index), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"version": version, "images": entries}, f)
+
+    for file in (tmp, tmp_index):
+        os.chmod(file, 0o644)
+    os.replace(tmp, fp)
+    os.replace(tmp_index, index)
+
+    return sum(map(len, entries.values()))
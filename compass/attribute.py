@@ -21,6 +21,7 @@ along with this program. If not, see <https://www.gnu.org/licenses/>.
 """
 
 __all__ = (
+    "ADVANTAGE_MATRIX",
     "Attribute",
 )
 
@@ -28,9 +29,17 @@ __all__ = (
 from enum import Enum
 from typing import TypeVar
 
+import numpy as np
+
 
 Self = TypeVar("Self", bound="Attribute")
 
+_attribute_order = ("WATER", "FIRE", "WOOD",)
+
+# damage multipliers applied by attribute advantage
+_advantage_rate = 1.2
+_disadvantage_rate = 0.8
+
 
 class Attribute(str, Enum):
     """Attribute of the card."""
@@ -44,8 +53,8 @@ class Attribute(str, Enum):
 
     def __lt__(self, obj: str | Self) -> bool:
         obj = self.__class__(obj)
-        return (self, obj) in [(self.WATER, self.WOOD), (self.WOOD, self.FIRE),
-                               (self.FIRE, self.WATER),]
+        return ADVANTAGE_MATRIX[_attribute_order.index(obj.name),
+                                _attribute_order.index(self.name)] > 1
 
     def __le__(self, obj: str | Self) -> bool:
         return self.__lt__(obj) or self.__eq__(obj)
@@ -65,3 +74,14 @@ class Attribute(str, Enum):
             self.WOOD: 0x59B93A
         }
         return d[self]
+
+
+# Damage multipliers of the attacker's attribute (row) against the defender's
+# attribute (column); rows and columns are ordered as ``_attribute_order``.
+# Water beats fire, fire beats wood and wood beats water.
+ADVANTAGE_MATRIX = np.array([
+    [1.0, _advantage_rate, _disadvantage_rate],
+    [_disadvantage_rate, 1.0, _advantage_rate],
+    [_advantage_rate, _disadvantage_rate, 1.0],
+])
+ADVANTAGE_MATRIX.setflags(write=False)
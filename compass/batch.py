@@ -0,0 +1,175 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "BatchResult",
+    "render_cards",
+)
+
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from tempfile import mkstemp
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+from .cache import _asset_version, _digest
+from .card import Card
+from .data import CardData
+from .utils import preload_images
+
+
+class BatchResult(NamedTuple):
+    """Result of :func:`render_cards`."""
+
+    rendered: int
+    skipped: int
+    seconds: float
+    errors: dict[str, Exception]
+
+    @property
+    def throughput(self) -> float:
+        """The number of rendered images per second."""
+        return self.rendered / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.rendered} images rendered, {self.skipped} skipped, " \
+               f"{len(self.errors)} failed in {self.seconds:.1f}s ({self.throughput:.1f} images/s)"
+
+
+def _write_atomic(fp: str, data: bytes) -> None:
+    """Writes the data so that readers never see a partial file."""
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    fd, tmp = mkstemp(dir=os.path.dirname(fp), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, fp)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _render(card: Card, level: int, locale: str, fp: str) -> None:
+    """Renders a card detail image in a worker process."""
+    buffer = BytesIO()
+    card.generate_image(level=level, locale=locale).save(buffer, format="PNG")
+    _write_atomic(fp, buffer.getvalue())
+
+
+def render_cards(cards: CardData, outdir: str,
+                 levels: list[int] = [50],
+                 locales: list[str] = ["ja"],
+                 processes: int | None = None,
+                 callback: Callable[[int, int], None] | None = None) -> BatchResult:
+    """Renders card detail images of all cards, levels and locales.
+
+    Images are saved as ``{outdir}/{locale}/{level}/{num}.png`` as soon as
+    each one is rendered. The content hash of every image (card data,
+    level, locale and the images, fonts and translations used) is recorded
+    in ``{outdir}/manifest.json``, and up-to-date images are skipped. The
+    hash depends on the contents only, not on where they are installed.
+    An image that fails to render is reported in :attr:`BatchResult.errors`
+    and the rest of the batch goes on.
+
+    Parameters
+    ----------
+    cards: :class:`CardData`
+        Cards to be rendered.
+    outdir: :class:`str`
+        Directory to save images to.
+    levels: List[:class:`int`]
+        Levels of the cards to be displayed.
+    locales: List[:class:`str`]
+        Locales of the images.
+    processes: Optional[:class:`int`]
+        The number of worker processes. If omitted, the number of CPUs.
+        Each worker keeps its own font and image caches.
+    callback: Optional[Callable[[:class:`int`, :class:`int`], None]]
+        Called with the numbers of finished and all images to be rendered
+        every time an image is saved or fails.
+
+    Returns
+    -------
+    :class:`BatchResult`
+        The numbers of rendered and skipped images, the elapsed time and the
+        errors of the images that failed.
+
+    """
+
+    start = perf_counter()
+
+    manifest_path = os.path.join(outdir, "manifest.json")
+    try:
+        with open(manifest_path, "r") as f:
+            manifest: dict[str, str] = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    version = _asset_version()
+    tasks: list[tuple[Card, int, str, str, str]] = []
+    skipped = 0
+    for card in cards:
+        digest = _digest(card)
+        for locale in locales:
+            for level in levels:
+                name = f"{locale}/{level}/{card.num}.png"
+                content = hashlib.sha256(f"{version}:{digest}:{level}:{locale}".encode()).hexdigest()
+                if manifest.get(name) == content and os.path.exists(os.path.join(outdir, name)):
+                    skipped += 1
+                    continue
+                tasks.append((card, level, locale, name, content))
+
+    os.makedirs(outdir, exist_ok=True)
+
+    def save_manifest() -> None:
+        _write_atomic(manifest_path, json.dumps(manifest, indent=0, sort_keys=True).encode())
+
+    errors: dict[str, Exception] = {}
+    if tasks:
+        with ProcessPoolExecutor(max_workers=processes, initializer=preload_images) as executor:
+            futures = {executor.submit(_render, card, level, locale, os.path.join(outdir, name)):
+                       (name, content) for card, level, locale, name, content in tasks}
+            try:
+                for done, future in enumerate(as_completed(futures), start=1):
+                    name, content = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors[name] = e
+                        manifest.pop(name, None)
+                    else:
+                        manifest[name] = content
+                    if callback is not None:
+                        callback(done, len(tasks))
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+            finally:
+                save_manifest()
+
+    return BatchResult(len(tasks) - len(errors), skipped, perf_counter() - start,
+                       dict(sorted(errors.items())))
@@ -0,0 +1,432 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "CacheInfo",
+    "DiskCache",
+    "RenderCache",
+    "cached_render",
+    "disk_cache",
+    "render_cache",
+)
+
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache, partial, wraps
+from glob import glob
+from inspect import signature
+from io import BytesIO
+from tempfile import mkstemp
+from typing import Any, Callable, Hashable, NamedTuple, TypeVar
+
+import numpy as np
+from PIL import Image as PILImage
+from PIL.Image import Image
+
+from .atlas import atlas_version
+from .path import path
+from .utils import _file_digest
+
+
+Function = TypeVar("Function", bound=Callable[..., Image | bytes])
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of :class:`RenderCache`."""
+
+    hits: int
+    misses: int
+    entries: int
+    currsize: int
+    maxsize: int
+
+
+def _image_size(img: Image | bytes) -> int:
+    """Obtains the size of the decoded image (or the encoded bytes) in bytes."""
+    if isinstance(img, bytes):
+        return len(img)
+    return img.width * img.height * len(img.getbands())
+
+
+class RenderCache(object):
+    """Memory-bounded LRU cache of rendered images.
+
+    The cache is disabled until :meth:`enable` is called. Images are evicted
+    in least recently used order once the total decoded size exceeds
+    ``maxsize`` bytes. Callers always receive copies, so modifying a returned
+    image never affects the cached one. Encoded images are cached as bytes,
+    which are immutable and returned as they are.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, Image | bytes] = OrderedDict()
+        self._maxsize = 0
+        self._currsize = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this cache is enabled or not."""
+        return self._maxsize > 0
+
+    def enable(self, maxsize: int = 256 * 1024**2) -> None:
+        """Enables this cache.
+
+        Parameters
+        ----------
+        maxsize: :class:`int`
+            Upper limit of the total decoded size of cached images in bytes.
+
+        """
+
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def disable(self) -> None:
+        """Disables this cache and discards all cached images."""
+        with self._lock:
+            self._maxsize = 0
+            self._evict()
+
+    def clear(self) -> None:
+        """Discards all cached images and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._currsize = self._hits = self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Obtains the statistics of this cache."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries),
+                             self._currsize, self._maxsize)
+
+    def get(self, key: Hashable) -> Image | bytes | None:
+        """Obtains a copy of the cached image, or ``None`` if not cached."""
+        with self._lock:
+            img = self._entries.get(key)
+            if img is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return img if isinstance(img, bytes) else img.copy()
+
+    def put(self, key: Hashable, img: Image | bytes) -> None:
+        """Caches the image. The image must not be modified afterwards."""
+        size = _image_size(img)
+        with self._lock:
+            if size > self._maxsize:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._currsize -= _image_size(old)
+            self._entries[key] = img
+            self._currsize += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._currsize > self._maxsize:
+            _, img = self._entries.popitem(last=False)
+            self._currsize -= _image_size(img)
+
+
+render_cache = RenderCache()
+
+
+@lru_cache(maxsize=None)
+def _asset_digest() -> str:
+    """Obtains a digest of the files that generated images depend on.
+
+    Images (including thumbnails), fonts and translations are identified by
+    their paths relative to the package and their contents, so the digest is
+    the same on every machine and checkout. It is computed once per process;
+    :func:`compass.update.update_data` and
+    :func:`compass.thumbnail.build_thumbnails` clear it when they change
+    files.
+    """
+
+    files = []
+    for directory in (path.imgdir, path.cps_imgdir, path.thumbnaildir,
+                      path.fontdir, path.localedir):
+        files.extend(glob(directory + "/**/*.*", recursive=True))
+
+    h = hashlib.sha256()
+    for file in sorted(files):
+        if file.endswith(".tmp"):
+            continue
+        name = os.path.relpath(file, os.path.dirname(path.imgdir)).replace(os.sep, "/")
+        h.update(f"{name}:{_file_digest(file)}\n".encode())
+    return h.hexdigest()
+
+
+def _asset_version() -> str:
+    """Obtains the version of the assets, including the atlas if enabled."""
+    version = _asset_digest()
+    atlas = atlas_version()
+    return version if atlas is None else f"{version}:{atlas}"
+
+
+class DiskCache(object):
+    """Size-bounded LRU cache of rendered images shared across processes.
+
+    Images are stored as encoded PNG files named after the hash of the key
+    and the asset version, so processes rendering the same image share one
+    file. Encoded images are stored as they are. Files are written
+    atomically, and the least recently used files are removed once the total
+    size exceeds ``maxsize`` bytes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._directory: str | None = None
+        self._maxsize = 0
+        self._written = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether this cache is enabled or not."""
+        return self._directory is not None
+
+    def enable(self, directory: str, maxsize: int = 1024**3) -> None:
+        """Enables this cache.
+
+        Parameters
+        ----------
+        directory: :class:`str`
+            Directory to store images in. It may be shared by processes.
+        maxsize: :class:`int`
+            Upper limit of the total size of stored files in bytes.
+
+        """
+
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            self._directory = directory
+            self._maxsize = maxsize
+            self._written = maxsize # evict at the next store
+
+    def disable(self) -> None:
+        """Disables this cache. The stored files are kept."""
+        with self._lock:
+            self._directory = None
+
+    def info(self) -> CacheInfo:
+        """Obtains the statistics of this cache in this process."""
+        entries, currsize = 0, 0
+        if self._directory is not None:
+            for _, size, _ in self._files():
+                entries, currsize = entries + 1, currsize + size
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, entries, currsize, self._maxsize)
+
+    def _filename(self, key: Hashable, raw: bool = False) -> str:
+        name = hashlib.sha256(f"{_asset_version()}:{key!r}".encode()).hexdigest()
+        return os.path.join(self._directory, name[:2], name + (".bin" if raw else ".png"))
+
+    def _files(self) -> list[tuple[int, int, str]]:
+        """Obtains the stored files as tuples of access time, size and path."""
+        files = []
+        for file in glob(os.path.join(self._directory, "*", "*.*")):
+            if file.endswith(".tmp"):
+                continue
+            try:
+                st = os.stat(file)
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, file))
+        return files
+
+    def get(self, key: Hashable, raw: bool = False) -> Image | bytes | None:
+        """Obtains the stored image, or ``None`` if not stored.
+
+        If ``raw`` is ``True``, the stored encoded image is returned as bytes.
+        """
+        filename = self._filename(key, raw)
+        try:
+            with open(filename, "rb") as f:
+                data = f.read()
+        except FileNotFoundError: # not stored or removed by another process
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            os.utime(filename) # marks as recently used for eviction
+        except OSError: # removed, or owned by another user of a shared directory
+            pass
+        with self._lock:
+            self._hits += 1
+
+        if raw:
+            return data
+        img = PILImage.open(BytesIO(data))
+        img.load()
+        return img
+
+    def put(self, key: Hashable, img: Image | bytes) -> None:
+        """Stores the image. Bytes are stored as they are."""
+        raw = isinstance(img, bytes)
+        filename = self._filename(key, raw)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        if raw:
+            data = img
+        else:
+            buffer = BytesIO()
+            img.save(buffer, format="PNG")
+            data = buffer.getvalue()
+
+        fd, tmp = mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, filename)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            self._written += len(data)
+            if self._written < self._maxsize // 16:
+                return
+            self._written = 0
+        self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self._files())
+        currsize = sum(size for _, size, _ in files)
+        for _, size, file in files:
+            if currsize <= self._maxsize:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            except OSError: # owned by another user of a shared directory
+                continue
+            currsize -= size
+
+
+disk_cache = DiskCache()
+
+
+def _canonical(value: Any) -> Any:
+    """Converts record data into JSON values independent of where the data is installed.
+
+    Fields of dataclasses holding paths (``_img_path``, ``_iconpath``, ...)
+    are omitted, enumerations are converted into their values and arrays
+    (e.g. :class:`compass.Status`) into nested lists.
+    """
+    if is_dataclass(value):
+        return [type(value).__qualname__,
+                {field.name: _canonical(getattr(value, field.name))
+                 for field in fields(value) if not field.name.endswith("path")}]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__array__"):
+        return np.asarray(value).tolist()
+    if isinstance(value, Mapping):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, Iterable):
+        return [type(value).__qualname__, [_canonical(item) for item in value]]
+    raise RuntimeError(f"{type(value).__qualname__} cannot be digested.")
+
+
+def _digest(obj: Any) -> str:
+    """Obtains a digest of the record data, e.g. :class:`compass.Card` or :class:`compass.CardData`.
+
+    The digest depends only on the data, so it is the same on every machine
+    and checkout.
+    """
+    data = json.dumps(_canonical(obj), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converts the argument into a hashable value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    return value
+
+
+def cached_render(method: Function | None = None, *,
+                  raw: bool = False) -> Function | Callable[[Function], Function]:
+    """Decorator to cache images returned by a ``generate_*`` method.
+
+    Images are looked up in :data:`render_cache` and then in
+    :data:`disk_cache`. The key consists of the method, a digest of the record
+    data (so that an updated data snapshot never hits stale images) and the
+    arguments with their defaults applied. Methods returning encoded images
+    as :class:`bytes` must be decorated with ``@cached_render(raw=True)``,
+    and their results are cached as they are.
+    """
+
+    if method is None:
+        return partial(cached_render, raw=raw)
+
+    sig = signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs) -> Image | bytes:
+        if not (render_cache.enabled or disk_cache.enabled):
+            return method(self, *args, **kwargs)
+
+        bound = sig.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple((name, _freeze(value)) for name, value
+                          in list(bound.arguments.items())[1:])
+        key = (method.__qualname__, _digest(self), arguments)
+
+        if render_cache.enabled:
+            img = render_cache.get(key)
+            if img is not None:
+                return img
+
+        img = disk_cache.get(key, raw) if disk_cache.enabled else None
+        if img is None:
+            img = method(self, *args, **kwargs)
+            if isinstance(img, bytes) != raw:
+                raise RuntimeError(f"{method.__qualname__} must be decorated with "
+                                   f"cached_render(raw={isinstance(img, bytes)}).")
+            if disk_cache.enabled:
+                disk_cache.put(key, img)
+
+        if render_cache.enabled:
+            render_cache.put(key, img)
+            if not raw:
+                img = img.copy()
+        return img
+
+    return wrapper
@@ -26,25 +26,48 @@ __all__ = (
 
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import TypeVar
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageDraw
 from PIL.PngImagePlugin import PngImageFile
 
 from .activation import Activation
+from .atlas import load_image
 from .attribute import Attribute
+from .cache import cached_render
 from .note import Note
 from .path import path
 from .rank import Rank
 from .rarity import Rarity
 from .status import Parameter, Status
-from .utils import get_translator, merge_images_vertical
+from .thumbnail import open_thumbnail
+from .utils import (ImageFormat, encode_image, get_font, get_translator,
+                    merge_images_vertical, open_image, render_digits)
 
 
 Self = TypeVar("Self", bound="Card")
 
 
+@lru_cache(maxsize=None)
+def _detail_template(locale: str, lines: int) -> PngImageFile:
+    """Obtains the frames of a card detail image with ``lines`` lines of ability.
+
+    The above, middle and below frames are stacked and the static parts are
+    pasted once per locale and number of lines. The image is shared, so
+    callers must copy it before drawing.
+    """
+
+    img_below = open_image(path.detail.frame("below", locale)).copy()
+    img_below.paste(open_image(path.detail.cool_time("sec")), (332, 15))
+
+    img_middle = open_image(path.detail.frame("middle", locale))
+    pilimg_list = [img_middle for _ in range(lines -1)]
+    pilimg_list = [open_image(path.detail.frame("above", locale))] + pilimg_list + [img_below]
+    return merge_images_vertical(*pilimg_list, color=(0xEC, 0xED, 0xED, 0xFF)) # 0xECEDED
+
+
 @dataclass
 class Card(object):
     """Class of a card data."""
@@ -66,11 +89,15 @@ class Card(object):
 
     _img_path: str = ""
 
+    # translations of the types and theme, which stay the keys of the data
+    _type_names: list[str] | None = None
+    _theme_name: str | None = None
+
     def __post_init__(self) -> None:
         self._img_path = path.card_img(self.num)
 
     def __str__(self) -> str:
-        return "【" + "・".join(self.types) + "】" + self.name
+        return "【" + "・".join(self.type_names) + "】" + self.name
 
     @property
     def num(self) -> int:
@@ -132,6 +159,16 @@ class Card(object):
         """Theme of this card."""
         return self._theme
 
+    @property
+    def type_names(self) -> list[str]:
+        """List of this card type, translated if this card is localized."""
+        return self._types if self._type_names is None else self._type_names
+
+    @property
+    def theme_name(self) -> str:
+        """Theme of this card, translated if this card is localized."""
+        return self._theme if self._theme_name is None else self._theme_name
+
     @property
     def abbreviations(self) -> list[str]:
         """Abbreviations of this card."""
@@ -150,7 +187,49 @@ class Card(object):
     @property
     def image(self) -> PngImageFile:
         """Obtains this card's image as :class:`PIL.PngImagePlugin.PngImageFile`"""
-        return Image.open(self.img_path).convert("RGBA")
+        return load_image("card", self.num)
+
+    def thumbnail(self, width: int | None = None, height: int | None = None) -> PngImageFile:
+        """Obtains the smallest image of this card at least as large as the size.
+
+        Parameters
+        ----------
+        width: Optional[:class:`int`]
+            Minimum width of the image.
+        height: Optional[:class:`int`]
+            Minimum height of the image.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            A thumbnail generated by :func:`compass.thumbnail.build_thumbnails`,
+            or the original image if no thumbnail is large enough.
+
+        """
+        return open_thumbnail("card", self.num, width, height)
+
+    def localized(self, locale: str = "ja") -> Self:
+        """Obtains a copy of this card whose texts are translated.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`compass.Card`
+            Copy of this card with the name and ability translated.
+            Untranslated texts are left as they are. :attr:`types` and
+            :attr:`theme` are kept as they are, since cards are classified
+            and searched by them; their translations are :attr:`type_names`
+            and :attr:`theme_name`.
+
+        """
+
+        _ = get_translator(locale)
+        return replace(self, _name=_(self.name), _ability=_(self.ability),
+                       _type_names=list(map(_, self.types)), _theme_name=_(self.theme))
 
     @classmethod
     def from_num(cls, num: int) -> Self:
@@ -193,6 +272,7 @@ class Card(object):
 
         return cls(**kwargs)
 
+    @cached_render
     def generate_image(self, level: int = 50, locale: str = "ja") -> PngImageFile:
         """Generates an image with processing applied.
 
@@ -213,18 +293,25 @@ class Card(object):
 
         """
 
-        font = ImageFont.truetype(path.font(locale), 26)
+        font = get_font(locale, 26)
+        _ = get_translator(locale)
 
-        img_above = Image.open(path.detail.frame("above", locale))
-        img_above.paste(Image.open(path.detail.rarity(self.rarity.name)), (46, 30))
+        ability = _(self.ability)
+        ability = ability.translate(str.maketrans({chr(0x0021 +i): chr(0xFF01 +i) for i in range(94)}))
+        ability = [ability[i *19: (i +1) *19] for i in range(len(ability) //19 +1)]
+        ability = ability[:-1] if ability[-1] == "" else ability
+        spacing = 5 - len(ability)
+
+        img = _detail_template(locale, len(ability)).copy()
+        img.paste(open_image(path.detail.rarity(self.rarity.name)), (46, 30))
 
-        _ = get_translator(locale)
         name = _(self.name)
-        draw = ImageDraw.Draw(img_above)
+        draw = ImageDraw.Draw(img)
         draw.text((125, 24), name.replace("∗", "＊"), (255, 255, 255), font=font)
-        img_above.paste(Image.open(path.detail.level(level)), (78, 35))
+        img.paste(open_image(path.detail.level(level)), (78, 35))
 
-        img_below = Image.open(path.detail.frame("below", locale))
+        # origin of the below frame
+        y = img.height - open_image(path.detail.frame("below", locale)).height
 
         status: Parameter = self.status.get(f"lv{level:02d}")
 
@@ -236,42 +323,57 @@ class Card(object):
         def_width = 336 if def_width > 336 else def_width
         phs_width = 336 if phs_width > 336 else phs_width
 
-        draw = ImageDraw.Draw(img_below)
-        draw.rectangle((150,  87, 150 +atk_width, 118), fill=(196, 216, 106))
-        draw.rectangle((150, 143, 150 +def_width, 174), fill=(196, 216, 106))
-        draw.rectangle((150, 199, 150 +phs_width, 230), fill=(196, 216, 106))
-
-        img_below_alpha = Image.new("RGBA", img_below.size, (255, 255, 255, 0))
+        draw.rectangle((150,  87 +y, 150 +atk_width, 118 +y), fill=(196, 216, 106))
+        draw.rectangle((150, 143 +y, 150 +def_width, 174 +y), fill=(196, 216, 106))
+        draw.rectangle((150, 199 +y, 150 +phs_width, 230 +y), fill=(196, 216, 106))
 
         def fill_b(status: float, number: int) -> str:
             return ("b" *number +str(int(status)))[-number:]
 
-        for i in range(4):
-            img_below_alpha.paste(Image.open(path.detail.status(fill_b(status.attack, 4)[i])),(419 +16 *i, 97))
-            img_below_alpha.paste(Image.open(path.detail.status(fill_b(status.defense, 4)[i])),(419 +16 *i, 153))
-            img_below_alpha.paste(Image.open(path.detail.status(fill_b(status.physical, 4)[i])),(419 +16 *i, 209))
+        img.alpha_composite(render_digits(fill_b(status.attack, 4), path.detail.status), (419, 97 +y))
+        img.alpha_composite(render_digits(fill_b(status.defense, 4), path.detail.status), (419, 153 +y))
+        img.alpha_composite(render_digits(fill_b(status.physical, 4), path.detail.status), (419, 209 +y))
+        img.paste(open_image(path.detail.activation(self.activation.name.lower())), (624, 15 +y))
 
-        img_below = Image.alpha_composite(img_below, img_below_alpha)
-        img_below.paste(Image.open(path.detail.activation(self.activation.name.lower())), (624, 15))
-
-        cool = f"bb{self.cool_time}"[-3:]
-        for i in range(3):
-            img_below.paste(Image.open(path.detail.cool_time(cool[i])), (268 +19 *i, 21))
-        img_below.paste(Image.open(path.detail.cool_time("sec")), (332, 15))
-
-        _ = get_translator(locale)
-        ability = _(self.ability)
-        ability = ability.translate(str.maketrans({chr(0x0021 +i): chr(0xFF01 +i) for i in range(94)}))
-        ability = [ability[i *19: (i +1) *19] for i in range(len(ability) //19 +1)]
-        ability = ability[:-1] if ability[-1] == "" else ability
-        spacing = 5 - len(ability)
+        img.paste(render_digits(f"bb{self.cool_time}"[-3:], path.detail.cool_time), (268, 21 +y))
 
-        img_middle = Image.open(path.detail.frame("middle", locale))
-        pilimg_list = [img_middle for _ in range(len(ability) -1)]
-        pilimg_list = [img_above] + pilimg_list + [img_below]
         ability = "\n".join(ability)
-        img = merge_images_vertical(*pilimg_list, color=(0xEC, 0xED, 0xED, 0xFF)) # 0xECEDED
-        draw = ImageDraw.Draw(img)
         draw.text((261, 66), ability, (160, 160, 160), font=font, spacing=spacing)
 
-        return img.convert("RGBA")
+        return img
+
+    @cached_render(raw=True)
+    def generate_image_bytes(self, level: int = 50, locale: str = "ja",
+                             format: ImageFormat = "PNG", compress_level: int = 6,
+                             quality: int = 90, colors: int | None = None) -> bytes:
+        """Generates an encoded image ready to be sent.
+
+        Same as :meth:`generate_image` but the image is encoded, and the
+        encoded bytes are cached so that both rendering and encoding are
+        skipped next time.
+
+        Parameters
+        ----------
+        level: :class:`int`
+            Level of the card to be displayed.
+        locale: :class:`str`
+            If a corresponding image is available, it is used.
+        format: :class:`str`
+            Format of the encoded image, ``PNG``, ``WEBP`` or ``JPEG``.
+        compress_level: :class:`int`
+            Compression level of ``PNG`` from ``0`` (fastest) to ``9`` (smallest).
+        quality: :class:`int`
+            Quality of ``WEBP`` and ``JPEG`` from ``0`` to ``100``.
+        colors: Optional[:class:`int`]
+            If given, the image is quantized to a palette of this many colors.
+
+        Returns
+        -------
+        :class:`bytes`
+            Encoded image, see :func:`compass.utils.encode_image`.
+
+        """
+
+        img = self.generate_image(level=level, locale=locale)
+        return encode_image(img, format, compress_level=compress_level,
+                            quality=quality, colors=colors)
@@ -27,17 +27,26 @@ __all__ = (
 )
 
 
+import asyncio
+import operator
+import weakref
 from collections import UserList
+from concurrent.futures import Executor
+from functools import lru_cache
 from glob import glob
 from math import ceil, sqrt
 from os.path import basename, splitext
 from random import choice
-from typing import Any, TypeVar, overload
+from typing import Any, Callable, Hashable, Iterator, Literal, TypeVar, overload
 
+import numpy as np
+from numpy.typing import ArrayLike
 from PIL import Image, ImageDraw
 from PIL.PngImagePlugin import PngImageFile
 
-from .attribute import Attribute
+from .atlas import Kind, image_size
+from .attribute import ADVANTAGE_MATRIX, Attribute, _attribute_order
+from .cache import cached_render
 from .card import Card
 from .hero import Hero
 from .note import Note
@@ -46,9 +55,113 @@ from .rank import Rank
 from .rarity import Rarity
 from .role import Role
 from .stage import Stage
-from .status import Parameter
-from .utils import (add_margin, merge_images, merge_images_horizon,
-                    merge_images_vertical, similar)
+from .status import Parameter, Status, _interpolate
+from .utils import (ImageFormat, add_margin, encode_image, merge_images,
+                    merge_images_grouped, merge_images_horizon,
+                    merge_images_vertical, open_image, render_digits, similar)
+
+
+T = TypeVar("T")
+
+def _load_chunk(from_num: Callable[[int], T], nums: list[int]) -> list[T]:
+    return [from_num(num) for num in nums]
+
+
+async def _aload(from_num: Callable[[int], T], directory: str,
+                 executor: Executor | None, chunksize: int) -> list[T]:
+    """Loads records in the executor chunk by chunk without blocking the event loop."""
+
+    loop = asyncio.get_running_loop()
+    files = sorted(await loop.run_in_executor(executor, glob, directory + "/*.json"))
+    nums = list(map(lambda file: int(splitext(basename(file))[0]), files))
+
+    chunks = await asyncio.gather(*[
+        loop.run_in_executor(executor, _load_chunk, from_num, nums[i:i+chunksize])
+        for i in range(0, len(nums), chunksize)
+    ])
+    return [record for chunk in chunks for record in chunk]
+
+
+_deck_bg_color = (0xEC, 0xED, 0xED, 0xFF) # 0xECEDED
+
+@lru_cache(maxsize=None)
+def _deck_slots(sizes: tuple[tuple[int, int], ...]) -> PngImageFile:
+    """Obtains the row of 4 card slots with blank slots after cards of the sizes.
+
+    The image is shared, so callers must copy it before pasting cards.
+    """
+
+    pilimages = [Image.new("RGBA", size) for size in sizes]
+    blank = open_image(path.deck.blank())
+    for _ in range(4 - len(sizes)):
+        pilimages.append(blank)
+
+    imgprocs = []
+    imgprocs.append(add_margin(pilimages[0], top=10, right=10, bottom=10, left=80, color=_deck_bg_color))
+    imgprocs.append(add_margin(pilimages[1], top=10, right=10, bottom=10, left=10, color=_deck_bg_color))
+    imgprocs.append(add_margin(pilimages[2], top=10, right=10, bottom=10, left=10, color=_deck_bg_color))
+    imgprocs.append(add_margin(pilimages[3], top=10, right=80, bottom=10, left=10, color=_deck_bg_color))
+
+    return merge_images_horizon(*imgprocs, color=_deck_bg_color)
+
+
+@lru_cache(maxsize=None)
+def _deck_template(locale: str, height: int) -> PngImageFile:
+    """Obtains the above and below frames of a deck image around a row of the height.
+
+    The image is shared, so callers must copy it before drawing.
+    """
+
+    img_above = open_image(path.deck.frame("above", locale))
+    img_below = open_image(path.deck.frame("below", locale))
+    img_deck = Image.new("RGBA", (img_above.width, height), _deck_bg_color)
+    return merge_images_vertical(*[img_above, img_deck, img_below], color=_deck_bg_color)
+
+
+@lru_cache(maxsize=None)
+def _deck_level(level: int | str) -> PngImageFile:
+    """Obtains the level icon resized for a deck image."""
+    return open_image(path.deck.level(str(level))).resize(size=(40, 23))
+
+
+# values derived from datasets, kept out of the datasets so that pickling a
+# dataset (e.g. to send it to worker processes) never carries them
+_derived: dict[tuple[int, Hashable], Any] = {}
+
+def _derive(data: UserList, key: Hashable, build: Callable[[], T],
+            valid: Callable[[T], bool] | None = None) -> T:
+    """Obtains the value derived from the data, built once per data and key.
+
+    The value is rebuilt if ``valid`` returns ``False`` for it. It is
+    discarded when the data is garbage collected, so the identity of the
+    data is never reused for a stale value.
+    """
+    k = (id(data), key)
+    value = _derived.get(k, _derived)
+    if value is not _derived:
+        if valid is None or valid(value):
+            return value
+    else:
+        weakref.finalize(data, _derived.pop, k, None)
+    value = _derived[k] = build()
+    return value
+
+
+def _localized(data: UserList[T], locale: str) -> UserList[T]:
+    """Obtains the cached view of the data whose records are localized."""
+    return _derive(data, ("localized", locale),
+                   lambda: data.__class__([record.localized(locale) for record in data]))
+
+
+def _scaled(kind: Kind, num: int, image: Callable[[], PngImageFile],
+            thumbnail: Callable[[int, int], PngImageFile], scale: float) -> PngImageFile:
+    """Obtains the image scaled from the smallest sufficient thumbnail."""
+    if scale == 1:
+        return image()
+    width, height = image_size(kind, num)
+    size = (max(1, round(width*scale)), max(1, round(height*scale)))
+    img = thumbnail(*size)
+    return img if img.size == size else img.resize(size, reducing_gap=2.0)
 
 
 CardList = TypeVar("CardList", bound="CardData")
@@ -75,6 +188,38 @@ class CardData(UserList[Card]):
 
             for num in nums:
                 self.data.append(Card.from_num(num))
+            self._bind_status()
+
+    @classmethod
+    async def aload(cls: type[CardList], executor: Executor | None = None,
+                    chunksize: int = 64) -> CardList:
+        """Loads card data without blocking the event loop.
+
+        Same as ``CardData()`` but the files are listed and parsed in the
+        executor, ``chunksize`` cards at a time, so other coroutines keep
+        running while the data is loaded.
+
+        Parameters
+        ----------
+        executor: Optional[:class:`concurrent.futures.Executor`]
+            Executor to load the data in. If omitted, the default executor
+            of the event loop is used.
+        chunksize: :class:`int`
+            The number of cards parsed in one task.
+
+        Returns
+        -------
+        :class:`CardData`
+            Loaded data.
+
+        """
+        data = cls(await _aload(Card.from_num, path.card_data_dir(), executor, chunksize))
+        data._bind_status()
+        return data
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._bind_status() # unpickled cards belong only to this data
 
     def __str__(self) -> str:
         return f"{len(self)} Cards' Data"
@@ -109,6 +254,27 @@ class CardData(UserList[Card]):
         else:
             return super().__getitem__(*args)
 
+    def localized(self, locale: str = "ja") -> CardList:
+        """Obtains a view of this data whose texts are translated.
+
+        The view is created once per locale and cached for this data, so
+        texts are translated only once. It can be searched and sorted by
+        translated names, e.g. ``data.localized("zh-TW")["..."]``. Changes
+        made to this data afterwards are not reflected in cached views.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`CardData`
+            Data of cards translated by :meth:`compass.Card.localized`.
+
+        """
+        return _localized(self, locale)
+
     def _guess_card(self, key: str) -> Card:
         """Guesses :class:`compass.Card` from the input.
 
@@ -126,6 +292,127 @@ class CardData(UserList[Card]):
 
         return similar(key, self.data, lambda el: [el.name] + el.abbreviations)
 
+    def _positions(self, nums: ArrayLike) -> np.ndarray:
+        """Converts card numbers into positions in this data.
+
+        Parameters
+        ----------
+        nums: :class:`ArrayLike`
+            Array of card numbers of any shape.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of the same shape as ``nums`` containing the index of each
+            card in this data.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a card number is not contained in this data.
+
+        """
+
+        nums = np.asarray(nums, dtype=np.int64)
+        if not self.data: # nothing to search, and clipping below needs a card
+            if nums.size:
+                raise RuntimeError(f"Unknown card numbers: {np.unique(nums).tolist()}")
+            return np.zeros(nums.shape, dtype=np.intp)
+
+        own = np.fromiter((card.num for card in self), dtype=np.int64, count=len(self))
+        order = np.argsort(own)
+
+        idx = np.searchsorted(own, nums, sorter=order).clip(max=len(self)-1)
+        idx = order[idx]
+        if not np.array_equal(own[idx], nums):
+            missing = np.setdiff1d(nums, own)
+            raise RuntimeError(f"Unknown card numbers: {missing.tolist()}")
+
+        return idx
+
+    def advantage(self, attackers: ArrayLike, defenders: ArrayLike) -> np.ndarray:
+        """Obtains the attribute advantage multipliers between cards.
+
+        ``attackers`` and ``defenders`` are broadcast against each other, e.g.
+        arrays of decks of shape ``(N, 4, 1)`` and ``(N, 1, 4)`` give the
+        multipliers of all 16 card pairings of ``N`` deck pairs at once.
+
+        Parameters
+        ----------
+        attackers: :class:`ArrayLike`
+            Card numbers of the attacking cards.
+        defenders: :class:`ArrayLike`
+            Card numbers of the defending cards.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Multipliers taken from :data:`compass.ADVANTAGE_MATRIX` with the
+            broadcast shape of ``attackers`` and ``defenders``.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a card number is not contained in this data.
+
+        """
+
+        attrs = np.fromiter((_attribute_order.index(card.attribute.name) for card in self),
+                            dtype=np.intp, count=len(self))
+        return ADVANTAGE_MATRIX[attrs[self._positions(attackers)],
+                                attrs[self._positions(defenders)]]
+
+    def _stack_status(self) -> tuple[tuple[Card, ...], np.ndarray]:
+        cards = tuple(self.data)
+        array = np.stack([card.status.array for card in cards]) if cards else np.empty((0, 6, 3))
+        return cards, array
+
+    def _status_valid(self, value: tuple[tuple[Card, ...], np.ndarray]) -> bool:
+        cards = value[0]
+        return len(cards) == len(self.data) and all(map(operator.is_, cards, self.data))
+
+    def _bind_status(self) -> None:
+        """Makes the status of every card a view of the columnar store of this data."""
+        _, array = _derive(self, "status", self._stack_status)
+        for card, row in zip(self.data, array):
+            card._status = Status.from_array(row)
+
+    @property
+    def status_array(self) -> np.ndarray:
+        """Statuses of these cards as :class:`numpy.ndarray` of shape ``(N, 6, 3)``.
+
+        The axes are cards, levels 1, 20, 30, 40, 50 and 60, and ``attack``,
+        ``defense`` and ``physical``. For data loaded from files, the array is
+        built once when loaded and the :class:`compass.Status` of every card
+        is a view of its row, so changes made through either are visible in
+        both. For other data, or once cards are added, removed or reordered,
+        the statuses are stacked into a new array on the next access.
+        """
+        return _derive(self, "status", self._stack_status, self._status_valid)[1]
+
+    def interpolate(self, levels: ArrayLike) -> np.ndarray:
+        """Obtains parameters of all cards at arbitrary levels at once.
+
+        Parameters
+        ----------
+        levels: :class:`ArrayLike`
+            Levels between 1 and 60 of any shape.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape ``(N, *levels.shape, 3)``. Levels that a card
+            cannot reach are ``nan``.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a level is out of the range from 1 to 60.
+
+        """
+
+        return _interpolate(self.status_array, levels)
+
     def divide(self) -> dict[str, CardList]:
         """
         Divides into the following four types: ``offensive``, ``defensive``,
@@ -382,6 +669,51 @@ class CardData(UserList[Card]):
             retval = self.generate_large_image()
         return retval
 
+    @cached_render(raw=True)
+    def generate_image_bytes(self,
+                             levels: list[int] | None = [50]*4,
+                             locale: str = "ja",
+                             format: ImageFormat = "PNG", compress_level: int = 6,
+                             quality: int = 90, colors: int | None = None) -> bytes:
+        """Generates an encoded image ready to be sent.
+
+        Same as :meth:`generate_image` but the image is encoded, and the
+        encoded bytes are cached so that both rendering and encoding are
+        skipped next time.
+
+        Parameters
+        ----------
+        levels: Optional[List[int]]
+            Cards' level.
+        locale: str
+            If a corresponding image is available, it is used.
+        format: :class:`str`
+            Format of the encoded image, ``PNG``, ``WEBP`` or ``JPEG``.
+        compress_level: :class:`int`
+            Compression level of ``PNG`` from ``0`` (fastest) to ``9`` (smallest).
+        quality: :class:`int`
+            Quality of ``WEBP`` and ``JPEG`` from ``0`` to ``100``.
+        colors: Optional[:class:`int`]
+            If given, the image is quantized to a palette of this many colors.
+
+        Returns
+        -------
+        :class:`bytes`
+            Encoded image, see :func:`compass.utils.encode_image`.
+
+        Raises
+        ------
+        RuntimeError
+            The number of cards must be at least one. If there are zero cards,
+            this error is raised.
+
+        """
+
+        img = self.generate_image(levels=levels, locale=locale)
+        return encode_image(img, format, compress_level=compress_level,
+                            quality=quality, colors=colors)
+
+    @cached_render
     def generate_deck(self, levels: list[int] | None = [50]*4, locale: str = "ja") -> PngImageFile:
         """Generates deck image with processing applied.
 
@@ -413,36 +745,22 @@ class CardData(UserList[Card]):
 
         pilimages = [card.image for card in self]
 
-        for _ in range(4 - len(self)):
-            pilimages.append(Image.open(path.deck.blank()))
-
-        bg_color = (0xEC, 0xED, 0xED, 0xFF) # 0xECEDED
-
-        imgprocs = []
-        imgprocs.append(add_margin(pilimages[0], top=10, right=10, bottom=10, left=80, color=bg_color))
-        imgprocs.append(add_margin(pilimages[1], top=10, right=10, bottom=10, left=10, color=bg_color))
-        imgprocs.append(add_margin(pilimages[2], top=10, right=10, bottom=10, left=10, color=bg_color))
-        imgprocs.append(add_margin(pilimages[3], top=10, right=80, bottom=10, left=10, color=bg_color))
-
-        img_deck = merge_images_horizon(*imgprocs, color=bg_color)
+        img_deck = _deck_slots(tuple(pilimg.size for pilimg in pilimages)).copy()
+        x = 80
+        for pilimg in pilimages:
+            img_deck.paste(pilimg, (x, 10))
+            x += pilimg.width + 20
         img_deck = img_deck.resize((795, (img_deck.height *795) //img_deck.width))
 
-        img_above = Image.open(path.deck.frame("above", locale))
-        img_below = Image.open(path.deck.frame("below", locale))
-
-        img_deck_main = Image.new("RGBA", img_deck.size, (255, 255, 255, 0))
-        img_deck_alpha = Image.new("RGBA", img_deck.size, (255, 255, 255, 0))
-
-        img_deck_main.paste(img_deck, (0, 0))
+        # level icons are composited in the band of their height only
+        img_deck_alpha = Image.new("RGBA", (img_deck.width, 23), (255, 255, 255, 0))
         for i in range(len(levels)):
-            img_deck_alpha.paste(
-                Image.open(path.deck.level(str(levels[i]))).resize(size=(40, 23)),
-                (75 +170 *i, 65)
-            )
+            img_deck_alpha.paste(_deck_level(levels[i]), (75 +170 *i, 0))
+        img_deck.alpha_composite(img_deck_alpha, (0, 65))
 
-        img_deck = Image.alpha_composite(img_deck_main,img_deck_alpha)
-
-        img = merge_images_vertical(*[img_above, img_deck, img_below], color=bg_color)
+        img_above = open_image(path.deck.frame("above", locale))
+        img = _deck_template(locale, img_deck.height).copy()
+        img.paste(img_deck, (0, img_above.height))
 
         status = Parameter(0, 0, 0)
         for i in range(len(self)):
@@ -461,27 +779,16 @@ class CardData(UserList[Card]):
         draw.rectangle((157, 440, 157 +def_width, 471), fill=(196, 216, 106))
         draw.rectangle((157, 486, 157 +phs_width, 517), fill=(196, 216, 106))
 
-        img_alpha = Image.new("RGBA", img.size, (255, 255, 255, 0))
-
         def fill_b(status: float, number: int) -> str:
             return ("b"*number + str(int(status)))[-number:]
 
-        for i in range(5):
-            img_alpha.paste(
-                Image.open(path.deck.status(fill_b(status.attack, 5)[i])),
-                (660 +16 *i, 400)
-            )
-            img_alpha.paste(
-                Image.open(path.deck.status(fill_b(status.defense, 5)[i])),
-                (660 +16 *i, 446)
-            )
-            img_alpha.paste(
-                Image.open(path.deck.status(fill_b(status.physical, 5)[i])),
-                (660 +16 *i, 492)
-            )
-
-        return Image.alpha_composite(img, img_alpha).convert("RGBA")
+        img.alpha_composite(render_digits(fill_b(status.attack, 5), path.deck.status), (660, 400))
+        img.alpha_composite(render_digits(fill_b(status.defense, 5), path.deck.status), (660, 446))
+        img.alpha_composite(render_digits(fill_b(status.physical, 5), path.deck.status), (660, 492))
 
+        return img
+
+    @cached_render
     def generate_large_image(self) -> PngImageFile:
         """Generates large image with processing applied.
 
@@ -508,6 +815,49 @@ class CardData(UserList[Card]):
             number = int(ceil(sqrt(len(self))))
             return merge_images(*imgs, number=number)
 
+    def generate_pages(self, columns: int = 10, rows: int = 5,
+                       scale: float = 1.0) -> Iterator[PngImageFile]:
+        """Generates images of cards in a row page by page.
+
+        Pages are generated lazily and only the card images of the page being
+        generated are decoded, so the memory used does not depend on the
+        number of cards.
+
+        Parameters
+        ----------
+        columns: :class:`int`
+            The number of cards in the horizontal direction of a page.
+        rows: :class:`int`
+            The number of cards in the vertical direction of a page.
+        scale: :class:`float`
+            Scale of card images, e.g. ``0.5`` for half size thumbnails.
+
+        Returns
+        -------
+        Iterator[:class:`PngImageFile`]
+            Image objects of pages. The last page may be partially filled.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if ``columns``, ``rows`` or ``scale`` is not positive.
+            The arguments are checked when this method is called, not when
+            the first page is generated.
+
+        """
+
+        if columns < 1 or rows < 1 or scale <= 0:
+            raise RuntimeError("Columns, rows and scale must be positive.")
+
+        def pages() -> Iterator[PngImageFile]:
+            number = columns * rows
+            for i in range(0, len(self), number):
+                imgs = [_scaled("card", card.num, lambda card=card: card.image, card.thumbnail, scale)
+                        for card in self.data[i:i+number]]
+                yield merge_images(*imgs, number=columns)
+
+        return pages()
+
 
 HeroList = TypeVar("HeroList", bound="HeroData")
 
@@ -534,6 +884,31 @@ class HeroData(UserList[Hero]):
             for num in nums:
                 self.data.append(Hero.from_num(num))
 
+    @classmethod
+    async def aload(cls: type[HeroList], executor: Executor | None = None,
+                    chunksize: int = 64) -> HeroList:
+        """Loads hero data without blocking the event loop.
+
+        Same as ``HeroData()`` but the files are listed and parsed in the
+        executor, ``chunksize`` heroes at a time, so other coroutines keep
+        running while the data is loaded.
+
+        Parameters
+        ----------
+        executor: Optional[:class:`concurrent.futures.Executor`]
+            Executor to load the data in. If omitted, the default executor
+            of the event loop is used.
+        chunksize: :class:`int`
+            The number of heroes parsed in one task.
+
+        Returns
+        -------
+        :class:`HeroData`
+            Loaded data.
+
+        """
+        return cls(await _aload(Hero.from_num, path.hero_data_dir(), executor, chunksize))
+
     def __str__(self) -> str:
         return f"{len(self)} Heroes' Data"
 
@@ -558,6 +933,27 @@ class HeroData(UserList[Hero]):
         else:
             return super().__getitem__(*args)
 
+    def localized(self, locale: str = "ja") -> HeroList:
+        """Obtains a view of this data whose texts are translated.
+
+        The view is created once per locale and cached for this data, so
+        texts are translated only once. It can be searched and sorted by
+        translated names, e.g. ``data.localized("zh-TW")["..."]``. Changes
+        made to this data afterwards are not reflected in cached views.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`HeroData`
+            Data of heroes translated by :meth:`compass.Hero.localized`.
+
+        """
+        return _localized(self, locale)
+
     def _guess_hero(self, key: str) -> Hero:
         """Guesses :class:`compass.Hero` from the input.
 
@@ -625,6 +1021,164 @@ class HeroData(UserList[Hero]):
 
         return retval
 
+    @cached_render
+    def generate_image(self, columns: int | None = None, scale: float = 1.0,
+                       group: bool = False) -> PngImageFile:
+        """Generates an image of the icons of the heroes in a grid.
+
+        Parameters
+        ----------
+        columns: Optional[:class:`int`]
+            The number of icons in the horizontal direction.
+            If omitted, the grid is made as square as possible.
+        scale: :class:`float`
+            Scale of icons, e.g. ``0.5`` for half size thumbnails.
+        group: :class:`bool`
+            Whether or not to group heroes by role, each role from a new row.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            Image object with icons of heroes in a grid.
+
+        Raises
+        ------
+        RuntimeError
+            The number of heroes must be at least one, and ``columns`` and
+            ``scale`` must be positive. Otherwise this error is raised.
+
+        """
+
+        if len(self) == 0:
+            raise RuntimeError("Invalid length of data.")
+        if scale <= 0:
+            raise RuntimeError("Scale must be positive.")
+
+        if columns is None:
+            columns = int(ceil(sqrt(len(self))))
+        if group:
+            groups = [[hero for hero in self if hero.role == role] for role in Role]
+        else:
+            groups = [list(self)]
+
+        return merge_images_grouped(
+            [[_scaled("icon", hero.num, lambda hero=hero: hero.icon, hero.icon_thumbnail, scale)
+              for hero in heroes] for heroes in groups],
+            number=columns
+        )
+
+    def precompute_colors(self) -> list[int]:
+        """Computes main colors of all heroes at once.
+
+        Colors are cached in the :class:`compass.Hero` objects of this data,
+        so :attr:`compass.Hero.color` is an attribute read afterwards.
+
+        Returns
+        -------
+        List[:class:`int`]
+            Main colors of the heroes in this data.
+
+        """
+        return [hero.color for hero in self]
+
+    def effective_status(self, decks: list[CardData],
+                         levels: list[int] | None = None) -> np.ndarray:
+        """Computes effective parameters of every hero with every deck.
+
+        The effective parameter is the total parameter of the deck
+        multiplied by the hero's parameter.
+
+        Parameters
+        ----------
+        decks: List[:class:`CardData`]
+            Decks to be compared. Each deck consists of one to four cards.
+        levels: Optional[List[int]]
+            Cards' level for each position in the decks, between 1 and 60.
+            Levels between those in the card data are interpolated linearly,
+            and cards contribute nothing at levels they cannot reach.
+            If omitted or shorter than four, the remaining cards are level 50.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape ``(number of heroes, number of decks, 3)`` whose
+            last axis is ``attack``, ``defense`` and ``physical``.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a deck does not consist of one to four cards, or if
+            more than four levels or a level out of the range from 1 to 60
+            are given.
+
+        """
+
+        levels = [] if levels is None else list(levels)
+        if len(levels) > 4:
+            raise RuntimeError("Length of levels must be at most 4.")
+        levels += [50]*(4 - len(levels))
+        if any(not (1 <= len(deck) <= 4) for deck in decks):
+            raise RuntimeError("Length of each deck must be between 1 and 4.")
+
+        cards = [(i, j, card) for i, deck in enumerate(decks)
+                              for j, card in enumerate(deck)]
+        if cards:
+            statuses = _interpolate(np.stack([card.status.array for _, _, card in cards]), levels)
+            statuses = statuses[np.arange(len(cards)), [j for _, j, _ in cards]]
+            statuses = np.nan_to_num(statuses, nan=0.0) # levels the card cannot reach
+        else:
+            statuses = np.empty((0, 3))
+
+        totals = np.zeros((len(decks), 3))
+        np.add.at(totals, [i for i, _, _ in cards], statuses)
+
+        parameters = np.stack([hero.parameter.array for hero in self]) \
+                     if self else np.empty((0, 3))
+
+        return parameters[:, np.newaxis, :] * totals[np.newaxis, :, :]
+
+    def top_decks(self, decks: list[CardData], k: int = 1,
+                  key: Literal["attack", "defense", "physical"] = "attack",
+                  levels: list[int] | None = None) -> np.ndarray:
+        """Obtains the best decks for every hero.
+
+        Parameters
+        ----------
+        decks: List[:class:`CardData`]
+            Decks to be compared. Each deck consists of one to four cards.
+        k: :class:`int`
+            Number of decks per hero.
+        key: :class:`str`
+            Effective parameter by which decks are ranked.
+        levels: Optional[List[int]]
+            Cards' level for each position in the decks, as in
+            :meth:`effective_status`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape ``(number of heroes, k)`` containing indices of
+            ``decks`` in descending order of the effective parameter.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if ``k`` is not between 1 and the number of decks, or if
+            the decks or levels are invalid (see :meth:`effective_status`).
+
+        """
+
+        if not (1 <= k <= len(decks)):
+            raise RuntimeError("k must be between 1 and the number of decks.")
+
+        column = ("attack", "defense", "physical").index(key)
+        values = self.effective_status(decks, levels)[:, :, column]
+
+        idx = np.argpartition(-values, k-1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(values, idx, axis=1), axis=1, kind="stable")
+
+        return np.take_along_axis(idx, order, axis=1)
+
 
 StageList = TypeVar("StageList", bound="StageData")
 
@@ -651,6 +1205,31 @@ class StageData(UserList[Stage]):
             for id in ids:
                 self.data.append(Stage.from_id(id))
 
+    @classmethod
+    async def aload(cls: type[StageList], executor: Executor | None = None,
+                    chunksize: int = 64) -> StageList:
+        """Loads stage data without blocking the event loop.
+
+        Same as ``StageData()`` but the files are listed and parsed in the
+        executor, ``chunksize`` stages at a time, so other coroutines keep
+        running while the data is loaded.
+
+        Parameters
+        ----------
+        executor: Optional[:class:`concurrent.futures.Executor`]
+            Executor to load the data in. If omitted, the default executor
+            of the event loop is used.
+        chunksize: :class:`int`
+            The number of stages parsed in one task.
+
+        Returns
+        -------
+        :class:`StageData`
+            Loaded data.
+
+        """
+        return cls(await _aload(Stage.from_id, path.stage_data_dir(), executor, chunksize))
+
     def __str__(self) -> str:
         return f"{len(self)} Stages' Data"
 
@@ -675,6 +1254,27 @@ class StageData(UserList[Stage]):
         else:
             return super().__getitem__(*args)
 
+    def localized(self, locale: str = "ja") -> StageList:
+        """Obtains a view of this data whose texts are translated.
+
+        The view is created once per locale and cached for this data, so
+        texts are translated only once. It can be searched and sorted by
+        translated names, e.g. ``data.localized("zh-TW")["..."]``. Changes
+        made to this data afterwards are not reflected in cached views.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`StageData`
+            Data of stages translated by :meth:`compass.Stage.localized`.
+
+        """
+        return _localized(self, locale)
+
     def _guess_stage(self, key: str) -> Stage:
         """Guesses :class:`compass.Stage` from the input.
 
@@ -735,3 +1335,48 @@ class StageData(UserList[Stage]):
                 retval.append(stage)
 
         return retval
+
+    @cached_render
+    def generate_image(self, columns: int = 2, scale: float = 1.0,
+                       group: bool = False) -> PngImageFile:
+        """Generates an image of the stages in a grid.
+
+        Parameters
+        ----------
+        columns: :class:`int`
+            The number of stages in the horizontal direction.
+        scale: :class:`float`
+            Scale of stage images, e.g. ``0.5`` for half size thumbnails.
+        group: :class:`bool`
+            Whether or not to group stages by availability, stages currently
+            available for regular battles first, each group from a new row.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            Image object with images of stages in a grid.
+
+        Raises
+        ------
+        RuntimeError
+            The number of stages must be at least one, and ``columns`` and
+            ``scale`` must be positive. Otherwise this error is raised.
+
+        """
+
+        if len(self) == 0:
+            raise RuntimeError("Invalid length of data.")
+        if scale <= 0:
+            raise RuntimeError("Scale must be positive.")
+
+        if group:
+            groups = [[stage for stage in self if stage.now_available],
+                      [stage for stage in self if not stage.now_available]]
+        else:
+            groups = [list(self)]
+
+        return merge_images_grouped(
+            [[_scaled("stage", stage.id, lambda stage=stage: stage.image, stage.thumbnail, scale)
+              for stage in stages] for stages in groups],
+            number=columns
+        )
@@ -26,16 +26,18 @@ __all__ = (
 
 
 import json
-from dataclasses import dataclass
-from random import choice
+from dataclasses import dataclass, replace
+from functools import cached_property
 from typing import TypeVar
 
-from PIL import Image
 from PIL.PngImagePlugin import PngImageFile
 
+from .atlas import load_image
 from .path import path
 from .role import Role
 from .status import Parameter
+from .thumbnail import open_thumbnail
+from .utils import dominant_color, get_translator
 
 
 Self = TypeVar("Self", bound="Hero")
@@ -159,20 +161,84 @@ class Hero(object):
     @property
     def image(self) -> PngImageFile:
         """Obtains this hero's image as :class:`PIL.PngImagePlugin.PngImageFile`."""
-        return Image.open(self.img_path).convert("RGBA")
+        return load_image("hero", self.num)
 
     @property
     def icon(self) -> PngImageFile:
         """Obtains this hero's icon as :class:`PIL.PngImagePlugin.PngImageFile`."""
-        return Image.open(self.iconpath).convert("RGBA")
+        return load_image("icon", self.num)
 
-    @property
+    def thumbnail(self, width: int | None = None, height: int | None = None) -> PngImageFile:
+        """Obtains the smallest image of this hero at least as large as the size.
+
+        Parameters
+        ----------
+        width: Optional[:class:`int`]
+            Minimum width of the image.
+        height: Optional[:class:`int`]
+            Minimum height of the image.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            A thumbnail generated by :func:`compass.thumbnail.build_thumbnails`,
+            or the original image if no thumbnail is large enough.
+
+        """
+        return open_thumbnail("hero", self.num, width, height)
+
+    def icon_thumbnail(self, width: int | None = None, height: int | None = None) -> PngImageFile:
+        """Obtains the smallest icon of this hero at least as large as the size.
+
+        Parameters
+        ----------
+        width: Optional[:class:`int`]
+            Minimum width of the icon.
+        height: Optional[:class:`int`]
+            Minimum height of the icon.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            A thumbnail generated by :func:`compass.thumbnail.build_thumbnails`,
+            or the original icon if no thumbnail is large enough.
+
+        """
+        return open_thumbnail("icon", self.num, width, height)
+
+    def localized(self, locale: str = "ja") -> Self:
+        """Obtains a copy of this hero whose texts are translated.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`compass.Hero`
+            Copy of this hero with the name, names and descriptions of the
+            skills translated. Untranslated texts are left as they are.
+
+        """
+
+        _ = get_translator(locale)
+        hero = replace(self, _name=_(self.name),
+                       _ultname=_(self.ultname), _ultinvincible=_(self.ultinvincible), _ult=_(self.ult),
+                       _haname=_(self.haname), _ha=_(self.ha),
+                       _abilityname=_(self.abilityname), _ability=_(self.ability))
+        if "color" in self.__dict__: # the icon is the same
+            hero.__dict__["color"] = self.color
+        return hero
+
+    @cached_property
     def color(self) -> int:
-        """Obtains main color of this hero."""
-        img = self.icon
-        x, y = choice(range(img.size[0])), choice(range(img.size[1]))
-        r, g, b, a = img.getpixel((x, y))
-        return (((r << 8) + g) << 8) + b
+        """Obtains main color of this hero, the dominant color of the icon.
+
+        It is computed once per object. See also
+        :meth:`compass.HeroData.precompute_colors`.
+        """
+        return dominant_color(self.icon)
 
     @classmethod
     def from_num(cls, num: int) -> Self:
@@ -39,6 +39,7 @@ _CPS_IMG = f"{_COMPASS_DATA}/img"
 _DATA = f"{_ROOTPATH}/data"
 _FONT = f"{_ROOTPATH}/font"
 _IMG = f"{_ROOTPATH}/img"
+_THUMBNAILS = f"{_ROOTPATH}/thumbnails"
 
 _DECK_IMG = f"{_IMG}/deck"
 _DETAIL_IMG = f"{_IMG}/detail"
@@ -72,21 +73,34 @@ class Path(object):
         return f"{self.stage_data_dir()}/{num}.json"
 
 
-    def card_img(self, num: int) -> str:
-        """Path to card image."""
-        return f"{_CPS_IMG}/card/{num}.png"
+    def card_img(self, num: int, reduce: int = 1) -> str:
+        """Path to card image, or to its thumbnail reduced by ``reduce`` times."""
+        if reduce == 1:
+            return f"{_CPS_IMG}/card/{num}.png"
+        return f"{_THUMBNAILS}/card/{reduce}/{num}.png"
 
-    def hero_img(self, num: int) -> str:
-        """Path to hero image."""
-        return f"{_CPS_IMG}/hero/{num}.png"
+    def hero_img(self, num: int, reduce: int = 1) -> str:
+        """Path to hero image, or to its thumbnail reduced by ``reduce`` times."""
+        if reduce == 1:
+            return f"{_CPS_IMG}/hero/{num}.png"
+        return f"{_THUMBNAILS}/hero/{reduce}/{num}.png"
 
-    def icon_img(self, num: int) -> str:
-        """Path to icon image."""
-        return f"{_CPS_IMG}/icon/{num}.png"
+    def icon_img(self, num: int, reduce: int = 1) -> str:
+        """Path to icon image, or to its thumbnail reduced by ``reduce`` times."""
+        if reduce == 1:
+            return f"{_CPS_IMG}/icon/{num}.png"
+        return f"{_THUMBNAILS}/icon/{reduce}/{num}.png"
 
-    def stage_img(self, num: int) -> str:
-        """Path to stage image."""
-        return f"{_CPS_IMG}/stage/{num}.png"
+    def stage_img(self, num: int, reduce: int = 1) -> str:
+        """Path to stage image, or to its thumbnail reduced by ``reduce`` times."""
+        if reduce == 1:
+            return f"{_CPS_IMG}/stage/{num}.png"
+        return f"{_THUMBNAILS}/stage/{reduce}/{num}.png"
+
+    def img(self, kind: Literal["card", "hero", "icon", "stage"], num: int,
+            reduce: int = 1) -> str:
+        """Path to card, hero, icon or stage image."""
+        return getattr(self, f"{kind}_img")(num, reduce)
 
     @property
     def abbs_data(self) -> str:
@@ -150,11 +164,63 @@ class Path(object):
         """Path to a blank stage to generate embedded stage image."""
         return f"{_IMG}/stage.png"
 
+    @property
+    def atlas(self) -> str:
+        """Path to the atlas of raw card, hero, icon and stage images."""
+        return f"{_ROOTPATH}/atlas.rgba"
+
+    @property
+    def atlas_index(self) -> str:
+        """Path to the index of the atlas."""
+        return f"{_ROOTPATH}/atlas.json"
+
+    @property
+    def cps_dir(self) -> str:
+        """Path to the directory of compass data."""
+        return _COMPASS_DATA
+
+    def cps_manifest(self, directory: str = _COMPASS_DATA) -> str:
+        """Path to the manifest of compass data written by :func:`compass.update.update_data`."""
+        return f"{directory}/manifest.json"
+
+    @property
+    def cps_imgdir(self) -> str:
+        """Path to the directory of card, hero, icon and stage images."""
+        return _CPS_IMG
+
+    @property
+    def thumbnaildir(self) -> str:
+        """Path to the directory of thumbnails."""
+        return _THUMBNAILS
+
+    @property
+    def thumbnail_manifest(self) -> str:
+        """Path to the digests of the images the thumbnails were generated from."""
+        return f"{_THUMBNAILS}/manifest.json"
+
+    @property
+    def fontdir(self) -> str:
+        """Path to font directory."""
+        return _FONT
+
+    @property
+    def imgdir(self) -> str:
+        """Path to the directory of images for generating images."""
+        return _IMG
+
     @property
     def localedir(self) -> str:
         """Path to locale directory."""
         return f"{_ROOTPATH}/locale"
 
+    def catalog(self, lang: str, domain: str) -> str:
+        """Path to the binary catalog of the domain for the language."""
+        return f"{self.localedir}/{lang}/LC_MESSAGES/{domain}.mo"
+
+    def merged_catalog(self, lang: str) -> str:
+        """Path to the catalog of all domains merged by ``i18n/mergemo.py``."""
+        return self.catalog(lang, "merged")
+
 
 path = Path()
 
@@ -26,14 +26,17 @@ __all__ = (
 
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import TypeVar
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from PIL.PngImagePlugin import PngImageFile
 
+from .atlas import load_image
+from .cache import cached_render
 from .path import path
-from .utils import get_translator
+from .thumbnail import open_thumbnail
+from .utils import ImageFormat, encode_image, get_font, get_translator, open_image
 
 
 Self = TypeVar("Self", bound="Stage")
@@ -102,7 +105,45 @@ class Stage(object):
     @property
     def image(self) -> PngImageFile:
         """Obtains this stage's image as :class:`PIL.PngImagePlugin.PngImageFile`."""
-        return Image.open(self.img_path).convert("RGBA")
+        return load_image("stage", self.id)
+
+    def thumbnail(self, width: int | None = None, height: int | None = None) -> PngImageFile:
+        """Obtains the smallest image of this stage at least as large as the size.
+
+        Parameters
+        ----------
+        width: Optional[:class:`int`]
+            Minimum width of the image.
+        height: Optional[:class:`int`]
+            Minimum height of the image.
+
+        Returns
+        -------
+        :class:`PngImageFile`
+            A thumbnail generated by :func:`compass.thumbnail.build_thumbnails`,
+            or the original image if no thumbnail is large enough.
+
+        """
+        return open_thumbnail("stage", self.id, width, height)
+
+    def localized(self, locale: str = "ja") -> Self:
+        """Obtains a copy of this stage whose texts are translated.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            Locale to translate into.
+
+        Returns
+        -------
+        :class:`compass.Stage`
+            Copy of this stage with the name and description translated.
+            Untranslated texts are left as they are.
+
+        """
+
+        _ = get_translator(locale)
+        return replace(self, _name=_(self.name), _description=_(self.description))
 
     @classmethod
     def from_id(cls, id: int) -> Self:
@@ -135,6 +176,7 @@ class Stage(object):
 
         return cls(**kwargs)
 
+    @cached_render
     def generate_image(self, locale: str = "ja") -> PngImageFile:
         """Generates an image with processing applied.
 
@@ -153,30 +195,62 @@ class Stage(object):
 
         """
 
-        base = Image.open(path.stage_blank).convert("RGBA")
+        base = open_image(path.stage_blank)
 
         img = Image.new("RGBA", base.size, color=(0xFF, 0xFF, 0xFF, 0x00))
         img.paste(self.image, (46, 23))
 
         base = Image.alpha_composite(base, img)
 
-        font = ImageFont.truetype(path.font(locale))
-
         draw = ImageDraw.Draw(base)
 
         _ = get_translator(locale)
         name = _(self.name)
-        font = ImageFont.truetype(path.font(locale), size=31)
+        font = get_font(locale, 31)
         draw.text((47, 165), name, (0x00, 0x00, 0x00), font=font)
 
         _ = get_translator(locale)
         description = _(self.description)
-        font = ImageFont.truetype(path.font(locale), size=25)
+        font = get_font(locale, 25)
         draw.text((47, 210), description, (0x64, 0x64, 0x64), font=font)
 
         _ = get_translator(locale)
         select = _("選択")
-        font = ImageFont.truetype(path.font(locale), size=28)
+        font = get_font(locale, 28)
         draw.text((614, 205), select, (0xFF, 0xFF, 0xFF), font=font, anchor="mm", align="center")
 
         return base.convert("RGBA")
+
+    @cached_render(raw=True)
+    def generate_image_bytes(self, locale: str = "ja",
+                             format: ImageFormat = "PNG", compress_level: int = 6,
+                             quality: int = 90, colors: int | None = None) -> bytes:
+        """Generates an encoded image ready to be sent.
+
+        Same as :meth:`generate_image` but the image is encoded, and the
+        encoded bytes are cached so that both rendering and encoding are
+        skipped next time.
+
+        Parameters
+        ----------
+        locale: :class:`str`
+            If a corresponding image is available, it is used.
+        format: :class:`str`
+            Format of the encoded image, ``PNG``, ``WEBP`` or ``JPEG``.
+        compress_level: :class:`int`
+            Compression level of ``PNG`` from ``0`` (fastest) to ``9`` (smallest).
+        quality: :class:`int`
+            Quality of ``WEBP`` and ``JPEG`` from ``0`` to ``100``.
+        colors: Optional[:class:`int`]
+            If given, the image is quantized to a palette of this many colors.
+
+        Returns
+        -------
+        :class:`bytes`
+            Encoded image, see :func:`compass.utils.encode_image`.
+
+        """
+
+        img = self.generate_image(locale=locale)
+        return encode_image(img, format, compress_level=compress_level,
+                            quality=quality, colors=colors)
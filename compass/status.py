@@ -27,69 +27,186 @@ __all__ = (
 
 
 from collections import UserDict
-from copy import copy
-from dataclasses import dataclass
 from typing import TypeVar
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 
 Self = TypeVar("Self", bound="Parameter")
+StatusSelf = TypeVar("StatusSelf", bound="Status")
+
+_levels = (1, 20, 30, 40, 50, 60,)
 
 
-@dataclass
 class Parameter(object):
-    """Parameter of the compass data."""
+    """Parameter of the compass data.
+
+    The values are stored in a :class:`numpy.ndarray` of shape ``(3,)`` in the
+    order of ``attack``, ``defense`` and ``physical``. A parameter obtained
+    from :class:`compass.Status` is a view of the status array.
+    """
+
+    __slots__ = ("_array",)
+
+    def __init__(self, attack: float, defense: float, physical: float) -> None:
+        self._array = np.array([attack, defense, physical], dtype=np.float64)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> Self:
+        """Class method to construct :class:`compass.Parameter` without copying.
+
+        Parameters
+        ----------
+        array: :class:`numpy.ndarray`
+            Array of shape ``(3,)`` and dtype ``float64``. The parameter
+            shares memory with this array.
+
+        Returns
+        -------
+        :class:`compass.Parameter`
+            Parameter backed by ``array``.
+
+        """
+
+        self = cls.__new__(cls)
+        self._array = array
+        return self
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(attack={self.attack!r}, " \
+               f"defense={self.defense!r}, physical={self.physical!r})"
+
+    def __copy__(self) -> Self:
+        return self.from_array(self._array.copy())
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self.__copy__()
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, tuple(self._array.tolist()))
 
-    attack: float
-    defense: float
-    physical: float
+    def __eq__(self, obj: object) -> bool:
+        if not isinstance(obj, Parameter):
+            return NotImplemented
+        return bool(np.array_equal(self._array, obj._array))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self._array if dtype is None else self._array.astype(dtype)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Values of this parameter as :class:`numpy.ndarray`."""
+        return self._array
+
+    @property
+    def attack(self) -> float:
+        """Attack value of this parameter."""
+        return float(self._array[0])
+
+    @attack.setter
+    def attack(self, value: float) -> None:
+        self._array[0] = value
+
+    @property
+    def defense(self) -> float:
+        """Defense value of this parameter."""
+        return float(self._array[1])
+
+    @defense.setter
+    def defense(self, value: float) -> None:
+        self._array[1] = value
+
+    @property
+    def physical(self) -> float:
+        """Physical value of this parameter."""
+        return float(self._array[2])
+
+    @physical.setter
+    def physical(self, value: float) -> None:
+        self._array[2] = value
 
     def __iadd__(self, obj: Self) -> Self:
-        self.attack += obj.attack
-        self.defense += obj.defense
-        self.physical += obj.physical
+        self._array += obj._array
         return self
 
     def __add__(self, obj: Self) -> Self:
-        tmp = copy(self)
-        tmp.__iadd__(obj)
-        return tmp
+        return self.from_array(self._array + obj._array)
 
     def __isub__(self, obj: Self) -> Self:
-        self.attack -= obj.attack
-        self.defense -= obj.defense
-        self.physical -= obj.physical
+        self._array -= obj._array
         return self
 
     def __sub__(self, obj: Self) -> Self:
-        tmp = copy(self)
-        tmp.__isub__(obj)
-        return tmp
+        return self.from_array(self._array - obj._array)
 
     def __imul__(self, obj: Self) -> Self:
-        self.attack *= obj.attack
-        self.defense *= obj.defense
-        self.physical *= obj.physical
+        self._array *= obj._array
         return self
 
     def __mul__(self, obj: Self) -> Self:
-        tmp = copy(self)
-        tmp.__imul__(obj)
-        return tmp
+        return self.from_array(self._array * obj._array)
 
     def __itruediv__(self, obj: Self) -> Self:
-        self.attack /= obj.attack
-        self.defense /= obj.defense
-        self.physical /= obj.physical
+        self._array /= obj._array
         return self
 
     def __truediv__(self, obj: Self) -> Self:
-        tmp = copy(self)
-        tmp.__itruediv__(obj)
-        return tmp
+        return self.from_array(self._array / obj._array)
+
+
+def _interpolate(array: np.ndarray, levels: ArrayLike) -> np.ndarray:
+    """Interpolates status arrays linearly to arbitrary levels.
+
+    Parameters
+    ----------
+    array: :class:`numpy.ndarray`
+        Status arrays of shape ``(..., 6, 3)``.
+    levels: :class:`ArrayLike`
+        Levels between 1 and 60 of any shape.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of shape ``(..., *levels.shape, 3)``. Levels above the maximum
+        level of a card (whose parameters are all zero) are ``nan``.
+
+    Raises
+    ------
+    RuntimeError
+        Raised if a level is out of the range from 1 to 60.
+
+    """
+
+    levels = np.asarray(levels, dtype=np.float64)
+    if np.any((levels < _levels[0]) | (levels > _levels[-1])):
+        raise RuntimeError(f"Level must be between {_levels[0]} and {_levels[-1]}.")
+
+    known = np.array(_levels, dtype=np.float64)
+    hi = np.searchsorted(known, levels).clip(1, len(known)-1)
+    lo = hi - 1
+    weight = ((levels - known[lo]) / (known[hi] - known[lo]))[..., np.newaxis]
+
+    retval = array[..., lo, :] * (1 - weight) + array[..., hi, :] * weight
+
+    # the last level with any non-zero parameter is the maximum level
+    available = np.any(array != 0, axis=-1)
+    maximum = known[len(known) - 1 - np.argmax(available[..., ::-1], axis=-1)]
+    beyond = levels > maximum.reshape(maximum.shape + (1,)*levels.ndim)
+    retval[beyond] = np.nan
+
+    return retval
 
 
 class Status(UserDict):
-    """Status of the card."""
+    """Status of the card.
+
+    The values are stored in a :class:`numpy.ndarray` of shape ``(6, 3)``,
+    whose rows are levels 1, 20, 30, 40, 50 and 60 and whose columns are
+    ``attack``, ``defense`` and ``physical``. Each :class:`compass.Parameter`
+    of this status is a view of a row; assigning a parameter to a level
+    writes its values into the row.
+    """
 
     def __init__(self,
                  atk: dict[str, int | float],
@@ -108,7 +225,100 @@ class Status(UserDict):
 
         """
 
+        array = np.array([[atk[f"lv{lv:02d}"], def_[f"lv{lv:02d}"], phs[f"lv{lv:02d}"]]
+                          for lv in _levels], dtype=np.float64)
+        self._bind(array)
+
+    def _bind(self, array: np.ndarray) -> None:
         super().__init__()
-        for lv in [1, 20, 30, 40, 50, 60]:
-            param = Parameter(atk[f"lv{lv:02d}"], def_[f"lv{lv:02d}"], phs[f"lv{lv:02d}"])
-            self.update({f"lv{lv:02d}": param})
+        self._array = array
+        for row, lv in enumerate(_levels):
+            self.data[f"lv{lv:02d}"] = Parameter.from_array(array[row])
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> StatusSelf:
+        """Class method to construct :class:`compass.Status` without copying.
+
+        Parameters
+        ----------
+        array: :class:`numpy.ndarray`
+            Array of shape ``(6, 3)`` and dtype ``float64``, e.g. a view of
+            :attr:`compass.CardData.status_array`.
+
+        Returns
+        -------
+        :class:`compass.Status`
+            Status backed by ``array``.
+
+        """
+
+        self = cls.__new__(cls)
+        self._bind(array)
+        return self
+
+    def __setitem__(self, key: str, value: Parameter | ArrayLike) -> None:
+        if key not in self.data:
+            raise RuntimeError(f"{key} is not a level of the status.")
+        # keep the view of the row so that the array stays the only storage
+        self.data[key]._array[:] = value._array if isinstance(value, Parameter) else value
+
+    def __delitem__(self, key: str) -> None:
+        raise RuntimeError("Levels cannot be removed from the status.")
+
+    def __copy__(self) -> StatusSelf:
+        return self.from_array(self._array.copy())
+
+    def __deepcopy__(self, memo: dict) -> StatusSelf:
+        return self.__copy__()
+
+    def copy(self) -> StatusSelf:
+        return self.__copy__()
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__.from_array, (self._array.copy(),))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self._array if dtype is None else self._array.astype(dtype)
+
+    @property
+    def array(self) -> np.ndarray:
+        """Values of this status as :class:`numpy.ndarray` of shape ``(6, 3)``."""
+        return self._array
+
+    def _operand(self, obj: StatusSelf | Parameter | float) -> np.ndarray | float:
+        return obj._array if isinstance(obj, (Status, Parameter)) else obj
+
+    def __add__(self, obj: StatusSelf | Parameter | float) -> StatusSelf:
+        return self.from_array(self._array + self._operand(obj))
+
+    def __sub__(self, obj: StatusSelf | Parameter | float) -> StatusSelf:
+        return self.from_array(self._array - self._operand(obj))
+
+    def __mul__(self, obj: StatusSelf | Parameter | float) -> StatusSelf:
+        return self.from_array(self._array * self._operand(obj))
+
+    def __truediv__(self, obj: StatusSelf | Parameter | float) -> StatusSelf:
+        return self.from_array(self._array / self._operand(obj))
+
+    def interpolate(self, levels: ArrayLike) -> np.ndarray:
+        """Obtains parameters at arbitrary levels by linear interpolation.
+
+        Parameters
+        ----------
+        levels: :class:`ArrayLike`
+            Levels between 1 and 60 of any shape.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape ``(*levels.shape, 3)``. Levels that this card
+            cannot reach are ``nan``.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a level is out of the range from 1 to 60.
+
+        """
+
+        return _interpolate(self._array, levels)
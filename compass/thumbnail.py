@@ -0,0 +1,149 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "build_thumbnails",
+    "open_thumbnail",
+)
+
+
+import json
+import os
+from glob import glob
+from os.path import basename, splitext
+from tempfile import mkstemp
+
+from PIL import Image
+from PIL.PngImagePlugin import PngImageFile
+
+from .atlas import Kind, _kinds, load_image
+from .cache import _asset_digest
+from .path import path
+from .utils import _file_digest
+
+
+# reduction factors of the thumbnails, each half the size of the previous one
+_factors = (2, 4, 8,)
+
+
+def build_thumbnails(kinds: tuple[Kind, ...] = _kinds, force: bool = False) -> int:
+    """Generates the thumbnails of card, hero, icon and stage images.
+
+    Thumbnails reduced by 2, 4 and 8 times are generated for every image.
+    The digest of every original image is recorded in
+    ``thumbnails/manifest.json``, and thumbnails of images whose content is
+    unchanged are skipped. Modification times are not used, as checking out
+    or extracting files does not preserve them.
+
+    Parameters
+    ----------
+    kinds: Tuple[:class:`str`, ...]
+        Kinds of the images to generate thumbnails of.
+    force: :class:`bool`
+        Whether or not to regenerate up-to-date thumbnails.
+
+    Returns
+    -------
+    :class:`int`
+        The number of generated thumbnails.
+
+    """
+
+    try:
+        with open(path.thumbnail_manifest, "r") as f:
+            manifest: dict[str, str] = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    count = 0
+    try:
+        for kind in kinds:
+            files = sorted(glob(f"{path.cps_imgdir}/{kind}/*.png"))
+            nums = list(map(lambda file: int(splitext(basename(file))[0]), files))
+
+            for num in nums:
+                original = path.img(kind, num)
+                targets = [path.img(kind, num, factor) for factor in _factors]
+                digest = _file_digest(original)
+                if not force and manifest.get(f"{kind}/{num}") == digest and \
+                   all(os.path.exists(target) for target in targets):
+                    continue
+
+                with Image.open(original) as img:
+                    img = img.convert("RGBA")
+
+                previous = 1
+                for factor, target in zip(_factors, targets):
+                    img = img.reduce(factor // previous)
+                    previous = factor
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    img.save(target, optimize=True)
+                    count += 1
+                manifest[f"{kind}/{num}"] = digest
+    finally:
+        if count:
+            fd, tmp = mkstemp(dir=os.path.dirname(path.thumbnail_manifest), suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f, indent=0, sort_keys=True)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, path.thumbnail_manifest)
+            _asset_digest.cache_clear()
+
+    return count
+
+
+def open_thumbnail(kind: Kind, num: int,
+                   width: int | None = None, height: int | None = None) -> PngImageFile:
+    """Opens the smallest image satisfying the requested size.
+
+    Parameters
+    ----------
+    kind: :class:`str`
+        Kind of the image, ``card``, ``hero``, ``icon`` or ``stage``.
+    num: :class:`int`
+        The number (ID for stages) of the image.
+    width: Optional[:class:`int`]
+        Minimum width of the image.
+    height: Optional[:class:`int`]
+        Minimum height of the image.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        The smallest thumbnail at least as large as the requested size, or
+        the original image (see :func:`compass.atlas.load_image`) if there
+        is no such thumbnail. The image is converted to ``RGBA`` and is not
+        resized to the requested size.
+
+    """
+
+    if width is not None or height is not None:
+        for factor in reversed(_factors):
+            try:
+                img = Image.open(path.img(kind, num, factor))
+            except FileNotFoundError:
+                continue
+            if (width is None or img.width >= width) and (height is None or img.height >= height):
+                return img.convert("RGBA")
+            img.close()
+
+    return load_image(kind, num)
@@ -0,0 +1,220 @@
+"""
+A library that provides Compass Data Structures
+
+The GNU General Public License v3.0 (GPL-3.0)
+
+Copyright (C) 2021-present ster <ster.physics@gmail.com>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+
+"""
+
+__all__ = (
+    "UpdateResult",
+    "update_data",
+)
+
+
+import json
+import os
+import posixpath
+import shutil
+import zlib
+from tempfile import mkstemp
+from time import perf_counter
+from typing import NamedTuple
+from zipfile import ZipFile
+
+from .cache import _asset_digest
+from .path import path
+
+
+# suffixes of the members of the release to be installed
+_suffixes = (".json", ".png",)
+
+
+class UpdateResult(NamedTuple):
+    """Result of :func:`update_data`. Paths are relative to the data directory."""
+
+    added: list[str]
+    modified: list[str]
+    removed: list[str]
+    unchanged: int
+    seconds: float
+
+    @property
+    def changes(self) -> list[str]:
+        """All added, modified and removed paths."""
+        return sorted(self.added + self.modified + self.removed)
+
+    def __str__(self) -> str:
+        return f"{len(self.added)} files added, {len(self.modified)} modified, " \
+               f"{len(self.removed)} removed, {self.unchanged} unchanged " \
+               f"in {self.seconds:.1f}s"
+
+
+def _crc32(fp: str) -> int:
+    """Computes the same checksum of the file as stored in zip archives."""
+    crc = 0
+    with open(fp, "rb") as f:
+        while chunk := f.read(1 << 20):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _member_path(name: str) -> str:
+    """Validates the name of a member, which must stay in the data directory."""
+    name = posixpath.normpath(name)
+    if posixpath.isabs(name) or name == ".." or name.startswith("../"):
+        raise RuntimeError(f"{name} is outside the data directory.")
+    return name
+
+
+def update_data(fp: str, directory: str = path.cps_dir,
+                remove: bool = False, verify: bool = False) -> UpdateResult:
+    """Installs the JSON and PNG files of a release of compass data that changed.
+
+    The checksum and size of every member of the zip archive, read from its
+    central directory, are compared with those of the installed files
+    recorded in ``{directory}/manifest.json``. Only changed members are
+    extracted, to temporary files first, which replace the installed files
+    after all of them are extracted. Unchanged files are left untouched and
+    keep their modification times. The version of the assets used in render
+    cache keys is recomputed once files have changed.
+
+    Each file is replaced atomically, but the release as a whole is not: if
+    the process dies while replacing files, some of them are old and some
+    new. The changed files are dropped from the manifest before any is
+    replaced, so running the update again checks them and completes it.
+
+    Parameters
+    ----------
+    fp: :class:`str`
+        Path to the zip archive of the release, e.g. ``data.zip``.
+    directory: :class:`str`
+        Directory the data is installed in.
+    remove: :class:`bool`
+        Whether or not to remove files installed by a previous update that
+        are no longer in the release.
+    verify: :class:`bool`
+        Whether or not to compute the checksums of installed files instead
+        of trusting the manifest.
+
+    Returns
+    -------
+    :class:`UpdateResult`
+        The added, modified and removed files.
+
+    Raises
+    ------
+    RuntimeError
+        A member of the archive is outside the data directory.
+
+    """
+
+    start = perf_counter()
+
+    manifest_path = path.cps_manifest(directory)
+    try:
+        with open(manifest_path, "r") as f:
+            manifest: dict[str, list[int]] = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+
+    added: list[str] = []
+    modified: list[str] = []
+    unchanged = 0
+    installed: dict[str, list[int]] = {}
+
+    with ZipFile(fp) as zf:
+        members = {}
+        for info in zf.infolist():
+            if info.is_dir() or not info.filename.endswith(_suffixes):
+                continue
+            name = _member_path(info.filename)
+            members[name] = info
+            installed[name] = [info.CRC, info.file_size]
+
+            target = os.path.join(directory, name)
+            try:
+                size = os.path.getsize(target)
+            except FileNotFoundError:
+                added.append(name)
+                continue
+
+            entry = manifest.get(name)
+            if verify or entry is None or entry[1] != size:
+                entry = [_crc32(target), size]
+            if entry == installed[name]:
+                unchanged += 1
+            else:
+                modified.append(name)
+
+        # extract all changed members before replacing any installed file
+        tmps: list[tuple[str, str]] = []
+        try:
+            for name in added + modified:
+                target = os.path.join(directory, name)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                fd, tmp = mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+                tmps.append((tmp, target))
+                with os.fdopen(fd, "wb") as f, zf.open(members[name]) as src:
+                    shutil.copyfileobj(src, f)
+                os.chmod(tmp, 0o644)
+        except BaseException:
+            for tmp, _ in tmps:
+                os.unlink(tmp)
+            raise
+
+    def write_manifest(entries: dict[str, list[int]]) -> None:
+        fd, tmp = mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entries, f, indent=0, sort_keys=True)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, manifest_path)
+
+    replaced = 0
+    try:
+        if tmps and manifest:
+            # files half way through the swap must not be trusted by the next update
+            changed = set(added + modified)
+            write_manifest({name: entry for name, entry in manifest.items() if name not in changed})
+        for tmp, target in tmps:
+            os.replace(tmp, target)
+            replaced += 1
+    except BaseException:
+        for tmp, _ in tmps[replaced:]:
+            os.unlink(tmp)
+        raise
+
+    removed: list[str] = []
+    if remove:
+        for name in sorted(manifest.keys() - installed.keys()):
+            try:
+                os.unlink(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+    else:
+        # keep tracking files installed by previous updates
+        installed = {**{name: manifest[name] for name in manifest.keys() - installed.keys()},
+                     **installed}
+
+    write_manifest(installed)
+
+    if tmps or removed: # images may have changed
+        _asset_digest.cache_clear()
+
+    return UpdateResult(sorted(added), sorted(modified), removed,
+                        unchanged, perf_counter() - start)
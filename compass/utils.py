@@ -25,19 +25,34 @@ __all__ = (
     "ImageType",
     "add_margin",
     "convert_to_square",
+    "dominant_color",
+    "encode_image",
+    "get_font",
     "get_translator",
     "merge_images",
+    "merge_images_grouped",
     "merge_images_horizon",
     "merge_images_vertical",
+    "open_image",
+    "preload_images",
+    "render_digits",
 )
 
 
-import gettext
+import builtins
+import hashlib
+import os
+import struct
+import threading
+from functools import lru_cache
 from glob import glob
+from io import BytesIO
 from os.path import basename
-from typing import Any, Callable, NewType
+from typing import Any, Callable, Iterable, Literal, NewType
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageFont
+from PIL.ImageFont import FreeTypeFont
 from PIL.JpegImagePlugin import JpegImageFile
 from PIL.PngImagePlugin import PngImageFile
 from rapidfuzz.process import cdist
@@ -45,9 +60,79 @@ from rapidfuzz.process import cdist
 from .path import path
 
 
+class _Catalog(dict[str, str]):
+    """Merged message catalog that returns untranslated messages as they are."""
+
+    def __missing__(self, message: str) -> str:
+        return message
+
+
+def _read_catalog(fp: str) -> dict[str, str]:
+    """Reads the messages of a binary GNU catalog (.mo file).
+
+    The file is parsed here rather than through :class:`gettext.GNUTranslations`,
+    whose parsed messages are not public. The header (the empty message) is
+    used only for its charset.
+    """
+
+    with open(fp, "rb") as f:
+        buf = f.read()
+
+    magic, = struct.unpack("<I", buf[:4])
+    fmt = "<" if magic == 0x950412de else ">"
+    _, n, koffset, voffset = struct.unpack(fmt + "4I", buf[4:20])
+
+    entries = []
+    for i in range(n):
+        klen, kpos = struct.unpack_from(fmt + "2I", buf, koffset + 8*i)
+        vlen, vpos = struct.unpack_from(fmt + "2I", buf, voffset + 8*i)
+        entries.append((buf[kpos:kpos + klen], buf[vpos:vpos + vlen]))
+
+    charset = "utf-8"
+    for key, value in entries:
+        if not key:
+            for line in value.decode("ascii", "replace").splitlines():
+                if line.lower().startswith("content-type:") and "charset=" in line:
+                    charset = line.split("charset=")[1].strip()
+
+    return {key.decode(charset): value.decode(charset) for key, value in entries if key}
+
+
+@lru_cache(maxsize=None)
+def _load_catalog(lang: str) -> _Catalog:
+    """Loads and merges the catalogs of all domains for the language.
+
+    The catalog merged at build time by ``i18n/mergemo.py`` is loaded with a
+    single read if it exists. Otherwise the domains are merged in the same
+    priority as ``i18n/mergemo.py``, i.e. a message is taken from the first
+    domain in alphabetical order containing it.
+    """
+
+    try:
+        return _Catalog(_read_catalog(path.merged_catalog(lang)))
+    except FileNotFoundError:
+        pass
+
+    files = sorted(glob(path.localedir + "/*.pot"))
+    domains = list(map(lambda file: basename(file)[:-4], files))
+
+    catalog = _Catalog()
+    for domain in reversed(domains):
+        try:
+            catalog.update(_read_catalog(path.catalog(lang, domain)))
+        except FileNotFoundError:
+            continue
+
+    return catalog
+
+
+@lru_cache(maxsize=None)
 def get_translator(lang: str = "ja") -> Callable[[str], str]:
     """Defines ``_`` to translate.
 
+    The catalogs of all domains are loaded and merged only once per
+    language, so translating is a single dictionary lookup.
+
     Parameters
     ----------
     lang: :class:`str`
@@ -68,51 +153,34 @@ def get_translator(lang: str = "ja") -> Callable[[str], str]:
 
     """
 
-    files = glob(path.localedir + "/*.pot")
-    domains = list(map(lambda file: basename(file)[:-4], files))
-
-    fallbacks = [
-        gettext.translation(
-            domain=domain,
-            localedir=path.localedir,
-            languages=(lang,),
-            fallback=True,
-        )
-        for domain in domains
-    ]
+    return _load_catalog(lang).__getitem__
 
-    translation = fallbacks[0]
-    for fallback in fallbacks[1:]:
-        translation.add_fallback(fallback)
 
-    return translation.gettext
+def _install_default_translator() -> None:
+    """Installs ``_`` to translate into Japanese.
 
+    Enumerations such as :class:`compass.Role` are defined with ``_`` and
+    their values must be the Japanese texts of compass data, so the Japanese
+    catalog is installed whichever other locales are available.
+    """
 
-def _install_default_translator() -> None:
-    """Installs ``_`` to translate."""
+    builtins.__dict__["_"] = get_translator("ja")
 
-    files = glob(path.localedir + "/*.pot")
-    domains = list(map(lambda file: basename(file)[:-4], files))
 
-    files = glob(path.localedir + "/*/LC_MESSAGES")
-    langs = tuple(map(lambda file: file.replace(f"{path.localedir}/", "")\
-                                      .replace("/LC_MESSAGES", ""), files))
+@lru_cache(maxsize=None)
+def _content_digest(fp: str, size: int, mtime_ns: int) -> str:
+    with open(fp, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
 
-    fallbacks = [
-        gettext.translation(
-            domain=domain,
-            localedir=path.localedir,
-            languages=langs,
-            fallback=True,
-        )
-        for domain in domains
-    ]
 
-    translation = fallbacks[0]
-    for fallback in fallbacks[1:]:
-        translation.add_fallback(fallback)
+def _file_digest(fp: str) -> str:
+    """Obtains a digest of the content of the file.
 
-    translation.install()
+    Digests are memoized per path, size and modification time, so a file is
+    read only once per process unless it changes.
+    """
+    st = os.stat(fp)
+    return _content_digest(fp, st.st_size, st.st_mtime_ns)
 
 
 ImageType = JpegImageFile | PngImageFile
@@ -121,6 +189,87 @@ ImageType = JpegImageFile | PngImageFile
 _bg_color = (0x2F, 0x31, 0x35, 0xFF) # 0x2F3135
 
 
+@lru_cache(maxsize=None)
+def open_image(fp: str) -> PngImageFile:
+    """Opens an image used for generating images.
+
+    Each image is read from disk and decoded only once per process; later
+    calls with the same path return the same object.
+
+    Parameters
+    ----------
+    fp: :class:`str`
+        Path to the image, e.g. one of :data:`compass.path.detail`.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Decoded image converted to ``RGBA``. The image is shared, so copy it
+        before modifying.
+
+    """
+
+    with Image.open(fp) as img:
+        return img.convert("RGBA")
+
+
+def preload_images(fps: Iterable[str] | None = None) -> None:
+    """Loads images into the cache of :func:`open_image` in advance.
+
+    Parameters
+    ----------
+    fps: Optional[Iterable[:class:`str`]]
+        Paths to the images. If omitted, all images under
+        :attr:`compass.path.imgdir` are loaded.
+
+    """
+
+    if fps is None:
+        fps = sorted(glob(path.imgdir + "/**/*.png", recursive=True) +
+                     glob(path.imgdir + "/**/*.jpg", recursive=True))
+
+    for fp in fps:
+        open_image(fp)
+
+
+class _FontCache(threading.local):
+    """Fonts loaded by the current thread."""
+
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[str, int], FreeTypeFont] = {}
+
+
+_font_cache = _FontCache()
+
+
+def get_font(locale: str = "ja", size: int = 10) -> FreeTypeFont:
+    """Obtains the font for the locale.
+
+    Each font is loaded only once per thread; a FreeType face must not be
+    used by multiple threads at the same time, so every thread that renders
+    has its own cache.
+
+    Parameters
+    ----------
+    locale: :class:`str`
+        Locale whose font is used.
+    size: :class:`int`
+        Size of the font.
+
+    Returns
+    -------
+    :class:`PIL.ImageFont.FreeTypeFont`
+        Loaded font object.
+
+    """
+
+    key = (path.font(locale), size)
+    font = _font_cache.fonts.get(key)
+    if font is None:
+        font = _font_cache.fonts[key] = ImageFont.truetype(*key)
+    return font
+
+
 def add_margin(pilimg: ImageType, /, *, top: int = 0, right: int = 0,
                bottom: int = 0, left: int = 0, color: int = _bg_color) -> PngImageFile:
     """Adds margin to ``PIL`` image.
@@ -156,6 +305,30 @@ def add_margin(pilimg: ImageType, /, *, top: int = 0, right: int = 0,
     return new_img.convert("RGBA")
 
 
+def _merge_rows(rows: list[list[ImageType]], color: int) -> PngImageFile:
+    """Merges rows of ``PIL`` images into one canvas.
+
+    The size of the canvas is computed first and every image is pasted
+    into it once. Each row is as high as its highest image, and images are
+    aligned to the top left of their cells.
+    """
+
+    heights = [max(pilimg.height for pilimg in row) for row in rows]
+    widths = [sum(pilimg.width for pilimg in row) for row in rows]
+
+    new_img = Image.new("RGBA", (max(widths), sum(heights)), color=color)
+
+    y = 0
+    for row, height in zip(rows, heights):
+        x = 0
+        for pilimg in row:
+            new_img.paste(pilimg if pilimg.mode == "RGBA" else pilimg.convert("RGBA"), (x, y))
+            x += pilimg.width
+        y += height
+
+    return new_img
+
+
 def merge_images_horizon(*pilimgs: ImageType, color: int = _bg_color) -> PngImageFile:
     """Merges ``PIL`` images horizontally.
 
@@ -175,23 +348,7 @@ def merge_images_horizon(*pilimgs: ImageType, color: int = _bg_color) -> PngImag
 
     """
 
-    def _merge_two_images(pilimg1: PngImageFile, pilimg2: PngImageFile) -> PngImageFile:
-        """Merges two ``PIL`` images horizontally."""
-
-        width = pilimg1.width + pilimg2.width
-        height = max(pilimg1.height, pilimg2.height)
-
-        new_img = Image.new(pilimg1.mode, (width, height), color=color)
-        new_img.paste(pilimg1, (0, 0))
-        new_img.paste(pilimg2, (pilimg1.width, 0))
-
-        return new_img
-
-    new_img = pilimgs[0].copy().convert("RGBA")
-    for pilimg in pilimgs[1:]:
-        new_img = _merge_two_images(new_img, pilimg.convert("RGBA"))
-
-    return new_img
+    return _merge_rows([list(pilimgs)], color)
 
 
 def merge_images_vertical(*pilimgs: ImageType, color: int = _bg_color) -> PngImageFile:
@@ -213,23 +370,7 @@ def merge_images_vertical(*pilimgs: ImageType, color: int = _bg_color) -> PngIma
 
     """
 
-    def _merge_two_images(pilimg1: PngImageFile, pilimg2: PngImageFile) -> PngImageFile:
-        """Merges two ``PIL`` images vertically."""
-
-        width = max(pilimg1.width, pilimg2.width)
-        height = pilimg1.height + pilimg2.height
-
-        new_img = Image.new(pilimg1.mode, (width, height), color=color)
-        new_img.paste(pilimg1, (0, 0))
-        new_img.paste(pilimg2, (0, pilimg1.height))
-
-        return new_img
-
-    new_img = pilimgs[0].copy().convert("RGBA")
-    for pilimg in pilimgs[1:]:
-        new_img = _merge_two_images(new_img, pilimg.convert("RGBA"))
-
-    return new_img
+    return _merge_rows([[pilimg] for pilimg in pilimgs], color)
 
 
 def merge_images(*pilimgs: ImageType, number: int = 1, color: int = _bg_color) -> PngImageFile:
@@ -262,18 +403,46 @@ def merge_images(*pilimgs: ImageType, number: int = 1, color: int = _bg_color) -
     if number < 1:
         raise RuntimeError("The number of horizontal images must be positive.")
 
-    horizontal_imgs: list[ImageType] = []
-    for i in range(len(pilimgs)//number):
-        horizontal_imgs.append(
-            merge_images_horizon(*pilimgs[i*number:(i+1)*number], color=color)
-        )
+    rows = [list(pilimgs[i:i+number]) for i in range(0, len(pilimgs), number)]
 
-    if len(pilimgs)/number - len(pilimgs)//number > 0:
-        horizontal_imgs.append(
-            merge_images_horizon(*pilimgs[number*(len(pilimgs)//number):], color=color)
-        )
+    return _merge_rows(rows, color)
 
-    return merge_images_vertical(*horizontal_imgs, color=color)
+
+def merge_images_grouped(groups: list[list[ImageType]], number: int = 1,
+                         color: int = _bg_color) -> PngImageFile:
+    """Merges groups of images in a tiled format, each group from a new row.
+
+    Parameters
+    ----------
+    groups: List[List[:class:`ImageType`]]
+        Groups of images to merge. Empty groups are skipped.
+    number: :class:`int`
+        The number of images in the horizontal direction.
+    color: :class:`int`
+        Color of the background added when the images are different
+        sizes or the number of images in a group is indivisible by ``number``.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Merged image. The original images are not changed.
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the number of images merged horizontally is
+        less than or equal to ``0``, or if there are no images.
+
+    """
+
+    if number < 1:
+        raise RuntimeError("The number of horizontal images must be positive.")
+
+    rows = [group[i:i+number] for group in groups for i in range(0, len(group), number)]
+    if not rows:
+        raise RuntimeError("There are no images to merge.")
+
+    return _merge_rows(rows, color)
 
 
 def convert_to_square(pilimg: ImageType, color: int = _bg_color) -> PngImageFile:
@@ -306,6 +475,129 @@ def convert_to_square(pilimg: ImageType, color: int = _bg_color) -> PngImageFile
         return new_img.convert("RGBA")
 
 
+# characters of digit glyphs, ``b`` is a blank
+_glyphs = "0123456789b"
+
+@lru_cache(maxsize=None)
+def _glyph_atlas(glyph: Callable[[str], str]) -> np.ndarray:
+    """Loads the digit glyphs into an array of shape ``(11, height, width, 4)``."""
+    return np.stack([np.asarray(open_image(glyph(char))) for char in _glyphs])
+
+
+def render_digits(text: str, glyph: Callable[[str], str]) -> PngImageFile:
+    """Renders digits as one strip of glyphs placed side by side.
+
+    Parameters
+    ----------
+    text: :class:`str`
+        Digits to render. ``b`` is rendered as a blank.
+    glyph: Callable[[:class:`str`], :class:`str`]
+        Function returning the path to the glyph image of a character,
+        e.g. ``path.detail.status``. All glyphs must have the same size.
+
+    Returns
+    -------
+    :class:`PngImageFile`
+        Strip of the glyphs, which can be composited in one operation.
+
+    """
+
+    atlas = _glyph_atlas(glyph)
+    strip = atlas[[_glyphs.index(char) for char in text]]
+    number, height, width, _ = strip.shape
+    return Image.fromarray(strip.transpose(1, 0, 2, 3).reshape(height, number *width, 4), "RGBA")
+
+
+ImageFormat = Literal["PNG", "WEBP", "JPEG"]
+
+def encode_image(pilimg: ImageType, format: ImageFormat = "PNG", *,
+                 compress_level: int = 6, quality: int = 90,
+                 colors: int | None = None) -> bytes:
+    """Encodes ``PIL`` image to bytes ready to be sent.
+
+    Parameters
+    ----------
+    pilimg: :class:`ImageType`
+        Target ``PIL`` image to encode.
+    format: :class:`str`
+        Format of the encoded image, ``PNG``, ``WEBP`` or ``JPEG``.
+    compress_level: :class:`int`
+        Compression level of ``PNG`` from ``0`` (fastest) to ``9`` (smallest).
+    quality: :class:`int`
+        Quality of ``WEBP`` and ``JPEG`` from ``0`` to ``100``.
+    colors: Optional[:class:`int`]
+        If given, the image is quantized to a palette of this many colors
+        (at most ``256``) before encoding, which makes ``PNG`` much smaller.
+        Ignored for ``JPEG``.
+
+    Returns
+    -------
+    :class:`bytes`
+        Encoded image. Transparent pixels are filled with the background
+        color for ``JPEG``. The original image is not changed.
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the format is not supported.
+
+    """
+
+    if pilimg.mode != "RGBA":
+        pilimg = pilimg.convert("RGBA")
+
+    buffer = BytesIO()
+    if format == "PNG":
+        if colors is not None:
+            pilimg = pilimg.quantize(colors, method=Image.Quantize.FASTOCTREE)
+        pilimg.save(buffer, format="PNG", compress_level=compress_level)
+    elif format == "WEBP":
+        if colors is not None:
+            pilimg = pilimg.quantize(colors, method=Image.Quantize.FASTOCTREE).convert("RGBA")
+        pilimg.save(buffer, format="WEBP", quality=quality, method=4)
+    elif format == "JPEG":
+        background = Image.new("RGBA", pilimg.size, _bg_color)
+        pilimg = Image.alpha_composite(background, pilimg).convert("RGB")
+        pilimg.save(buffer, format="JPEG", quality=quality, optimize=True)
+    else:
+        raise RuntimeError(f"Unsupported format: {format}")
+
+    return buffer.getvalue()
+
+
+def dominant_color(pilimg: ImageType) -> int:
+    """Obtains the dominant color of ``PIL`` image.
+
+    Opaque pixels are counted in a histogram of 16 levels per channel, and
+    the mean color of the pixels in the most frequent bin is returned.
+    Transparent pixels are ignored.
+
+    Parameters
+    ----------
+    pilimg: :class:`ImageType`
+        Target ``PIL`` image.
+
+    Returns
+    -------
+    :class:`int`
+        The dominant color as ``0xRRGGBB``, or ``0`` if the image is
+        completely transparent.
+
+    """
+
+    array = np.asarray(pilimg.convert("RGBA") if pilimg.mode != "RGBA" else pilimg)
+    rgb = array[array[..., 3] >= 128][:, :3]
+    if len(rgb) == 0:
+        return 0
+
+    bins = rgb.astype(np.intp) >> 4
+    keys = (bins[:, 0] << 8) | (bins[:, 1] << 4) | bins[:, 2]
+    top = np.bincount(keys, minlength=4096).argmax()
+
+    r, g, b = rgb[keys == top].mean(axis=0).round().astype(int)
+    return (((int(r) << 8) + int(g)) << 8) + int(b)
+
+
 Element = NewType("Element", list[Any])
 
 def similar(word: str,
@@ -0,0 +1,87 @@
+#! /usr/bin/env python3
+
+"""Compare the merged message catalog with the gettext fallback chain.
+
+For each locale, the time to load the catalogs and the time to translate all
+messages of all domains are measured for
+    chain:   gettext.GNUTranslations of every domain linked by add_fallback
+    runtime: the domains merged into one dictionary when loaded
+    merged:  the catalog merged by mergemo.py, loaded with a single read
+
+Usage: benchcatalog.py [-n number] [lang ...]
+
+    Run from the root of the repository.  The locales default to all locales.
+"""
+
+import getopt
+import gettext
+import os
+import sys
+from glob import glob
+from timeit import repeat
+
+sys.path.insert(0, os.getcwd())
+
+from compass.path import path
+from compass.utils import _Catalog, _read_catalog
+
+
+def chain(lang, domains):
+    translations = []
+    for domain in domains:
+        try:
+            with open(path.catalog(lang, domain), "rb") as f:
+                translations.append(gettext.GNUTranslations(f))
+        except FileNotFoundError:
+            translations.append(gettext.NullTranslations())
+    for fallback in translations[1:]:
+        translations[0].add_fallback(fallback)
+    return translations[0].gettext
+
+
+def runtime(lang, domains):
+    catalog = _Catalog()
+    for domain in reversed(domains):
+        try:
+            catalog.update(_read_catalog(path.catalog(lang, domain)))
+        except FileNotFoundError:
+            continue
+    return catalog.__getitem__
+
+
+def merged(lang, domains):
+    return _Catalog(_read_catalog(path.merged_catalog(lang))).__getitem__
+
+
+def main():
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 'hn:', ['help'])
+    except getopt.error as msg:
+        print(msg, file=sys.stderr)
+        sys.exit(1)
+
+    number = 100
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            print(__doc__, file=sys.stderr)
+            sys.exit(0)
+        elif opt == '-n':
+            number = int(arg)
+
+    domains = sorted(os.path.basename(file)[:-4] for file in glob(path.localedir + "/*.pot"))
+    langs = args or sorted(os.path.basename(os.path.dirname(dir))
+                           for dir in glob(path.localedir + "/*/LC_MESSAGES"))
+
+    print(f"{'lang':8}{'loader':10}{'load [us]':>12}{'lookup [ns/msg]':>18}")
+    for lang in langs:
+        messages = [key for key in merged(lang, domains).__self__ if isinstance(key, str) and key]
+        messages += [f"untranslated {i}" for i in range(len(messages))]
+        for loader in (chain, runtime, merged):
+            load = min(repeat(lambda: loader(lang, domains), number=number, repeat=5)) / number
+            _ = loader(lang, domains)
+            lookup = min(repeat(lambda: list(map(_, messages)), number=number, repeat=5)) / number
+            print(f"{lang:8}{loader.__name__:10}{load*1e6:12.1f}{lookup/len(messages)*1e9:18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#! /usr/bin/env python3
+
+"""Merge binary message catalogs of all domains into one catalog per locale.
+
+For every locale in the locale directory, the .mo files of the domains (the
+.pot files in the locale directory) are merged into LC_MESSAGES/merged.mo.
+A message is taken from the first domain in alphabetical order containing it,
+and the header from the first domain present.  The merged catalog is loaded
+with a single read and looked up without traversing gettext fallbacks.
+
+Usage: mergemo.py [localedir]
+
+    localedir defaults to compass/locale.
+"""
+
+import os
+import struct
+import sys
+from glob import glob
+
+from msgfmt import generate
+
+MERGED = "merged"
+
+
+def read(filename):
+    "Return the messages of the .mo file as a dictionary of bytes."
+    with open(filename, "rb") as f:
+        buf = f.read()
+
+    magic, = struct.unpack("<I", buf[:4])
+    fmt = "<" if magic == 0x950412de else ">"
+    _, n, koffset, voffset = struct.unpack(fmt + "4I", buf[4:20])
+
+    messages = {}
+    for i in range(n):
+        klen, kpos = struct.unpack(fmt + "2I", buf[koffset + 8*i:koffset + 8*i + 8])
+        vlen, vpos = struct.unpack(fmt + "2I", buf[voffset + 8*i:voffset + 8*i + 8])
+        messages[buf[kpos:kpos + klen]] = buf[vpos:vpos + vlen]
+    return messages
+
+
+def merge(localedir, lang, domains):
+    "Merge the catalogs of the domains for the locale, return the number of messages."
+    messages = {}
+    for domain in reversed(domains):
+        filename = os.path.join(localedir, lang, "LC_MESSAGES", domain + ".mo")
+        if os.path.exists(filename):
+            messages.update(read(filename))
+
+    outfile = os.path.join(localedir, lang, "LC_MESSAGES", MERGED + ".mo")
+    tmpfile = outfile + ".tmp"
+    with open(tmpfile, "wb") as f:
+        f.write(generate(messages))
+    os.replace(tmpfile, outfile)
+    return len(messages)
+
+
+def main():
+    if len(sys.argv) > 2 or sys.argv[1:] in (["-h"], ["--help"]):
+        print(__doc__, file=sys.stderr)
+        sys.exit(len(sys.argv) > 2)
+
+    localedir = sys.argv[1] if len(sys.argv) == 2 else "compass/locale"
+    domains = sorted(os.path.basename(file)[:-4] for file in glob(os.path.join(localedir, "*.pot")))
+    langs = sorted(os.path.basename(os.path.dirname(dir))
+                   for dir in glob(os.path.join(localedir, "*", "LC_MESSAGES")))
+
+    for lang in langs:
+        if os.path.islink(os.path.join(localedir, lang)): # shares the catalogs of another locale
+            continue
+        print(f"{lang}: {merge(localedir, lang, domains)} messages")
+
+
+if __name__ == '__main__':
+    main()
@@ -8,13 +8,23 @@ a binary GNU catalog (.mo file).  This is essentially the same function as the
 GNU msgfmt program, however, it is a simpler implementation.  Currently it
 does not handle plural forms but it does handle message contexts.
 
-Usage: msgfmt.py [OPTIONS] filename.po
+Usage: msgfmt.py [OPTIONS] filename.po ...
 
 Options:
     -o file
     --output-file=file
         Specify the output file to write to.  If omitted, output will go to a
-        file named filename.mo (based off the input file name).
+        file named filename.mo (based off the input file name).  Only allowed
+        with a single input file.
+
+    -m file
+    --manifest=file
+        Record the hash of every input file in this JSON file, and skip
+        inputs whose hash is unchanged since the output was generated.
+
+    -j n
+    --jobs=n
+        Compile in n processes in parallel.  Defaults to the number of CPUs.
 
     -h
     --help
@@ -28,14 +38,19 @@ Options:
 import os
 import sys
 import ast
+import json
 import getopt
+import hashlib
 import struct
 import array
+from concurrent.futures import ProcessPoolExecutor
 from email.parser import HeaderParser
 
-__version__ = "1.2"
+__version__ = "1.3"
+
 
-MESSAGES = {}
+class Error(Exception):
+    "Error in reading, parsing or writing a catalog, reported by main()."
 
 
 def usage(code, msg=''):
@@ -45,29 +60,27 @@ def usage(code, msg=''):
     sys.exit(code)
 
 
-def add(ctxt, id, str, fuzzy):
+def add(messages, ctxt, id, str, fuzzy):
     "Add a non-fuzzy translation to the dictionary."
-    global MESSAGES
     if not fuzzy and str:
         if ctxt is None:
-            MESSAGES[id] = str
+            messages[id] = str
         else:
-            MESSAGES[b"%b\x04%b" % (ctxt, id)] = str
+            messages[b"%b\x04%b" % (ctxt, id)] = str
 
 
-def generate():
+def generate(messages):
     "Return the generated output."
-    global MESSAGES
     # the keys are sorted in the .mo file
-    keys = sorted(MESSAGES.keys())
+    keys = sorted(messages.keys())
     offsets = []
     ids = strs = b''
     for id in keys:
         # For each string, we need size and file offset.  Each string is NUL
         # terminated; the NUL does not count into the size.
-        offsets.append((len(ids), len(id), len(strs), len(MESSAGES[id])))
+        offsets.append((len(ids), len(id), len(strs), len(messages[id])))
         ids += id + b'\0'
-        strs += MESSAGES[id] + b'\0'
+        strs += messages[id] + b'\0'
     output = ''
     # The header is 7 32-bit unsigned integers.  We don't use hash tables, so
     # the keys start right after the index tables.
@@ -96,26 +109,41 @@ def generate():
     return output
 
 
-def make(filename, outfile):
-    ID = 1
-    STR = 2
-    CTXT = 3
-
-    # Compute .mo name from .po name and arguments
+def names(filename, outfile):
+    "Compute .mo name from .po name and arguments."
     if filename.endswith('.po'):
         infile = filename
     else:
         infile = filename + '.po'
     if outfile is None:
         outfile = os.path.splitext(infile)[0] + '.mo'
+    return infile, outfile
+
+
+def digest(infile):
+    "Return the hash of the input file and the version of this program."
+    try:
+        with open(infile, 'rb') as f:
+            data = f.read()
+    except IOError as msg:
+        raise Error(msg)
+    return hashlib.sha256(__version__.encode() + b'\0' + data).hexdigest()
+
+
+def make(filename, outfile):
+    ID = 1
+    STR = 2
+    CTXT = 3
+
+    infile, outfile = names(filename, outfile)
 
     try:
         with open(infile, 'rb') as f:
             lines = f.readlines()
     except IOError as msg:
-        print(msg, file=sys.stderr)
-        sys.exit(1)
+        raise Error(msg)
 
+    messages = {}
     section = msgctxt = None
     fuzzy = 0
 
@@ -130,7 +158,7 @@ def make(filename, outfile):
         lno += 1
         # If we get a comment line after a msgstr, this is a new entry
         if l[0] == '#' and section == STR:
-            add(msgctxt, msgid, msgstr, fuzzy)
+            add(messages, msgctxt, msgid, msgstr, fuzzy)
             section = msgctxt = None
             fuzzy = 0
         # Record a fuzzy mark
@@ -142,13 +170,13 @@ def make(filename, outfile):
         # Now we are in a msgid or msgctxt section, output previous section
         if l.startswith('msgctxt'):
             if section == STR:
-                add(msgctxt, msgid, msgstr, fuzzy)
+                add(messages, msgctxt, msgid, msgstr, fuzzy)
             section = CTXT
             l = l[7:]
             msgctxt = b''
         elif l.startswith('msgid') and not l.startswith('msgid_plural'):
             if section == STR:
-                add(msgctxt, msgid, msgstr, fuzzy)
+                add(messages, msgctxt, msgid, msgstr, fuzzy)
                 if not msgid:
                     # See whether there is an encoding declaration
                     p = HeaderParser()
@@ -162,9 +190,7 @@ def make(filename, outfile):
         # This is a message with plural forms
         elif l.startswith('msgid_plural'):
             if section != ID:
-                print('msgid_plural not preceded by msgid on %s:%d' % (infile, lno),
-                      file=sys.stderr)
-                sys.exit(1)
+                raise Error('msgid_plural not preceded by msgid on %s:%d' % (infile, lno))
             l = l[12:]
             msgid += b'\0' # separator of singular and plural
             is_plural = True
@@ -173,23 +199,22 @@ def make(filename, outfile):
             section = STR
             if l.startswith('msgstr['):
                 if not is_plural:
-                    print('plural without msgid_plural on %s:%d' % (infile, lno),
-                          file=sys.stderr)
-                    sys.exit(1)
+                    raise Error('plural without msgid_plural on %s:%d' % (infile, lno))
                 l = l.split(']', 1)[1]
                 if msgstr:
                     msgstr += b'\0' # Separator of the various plural forms
             else:
                 if is_plural:
-                    print('indexed msgstr required for plural on  %s:%d' % (infile, lno),
-                          file=sys.stderr)
-                    sys.exit(1)
+                    raise Error('indexed msgstr required for plural on  %s:%d' % (infile, lno))
                 l = l[6:]
         # Skip empty lines
         l = l.strip()
         if not l:
             continue
-        l = ast.literal_eval(l)
+        try:
+            l = ast.literal_eval(l)
+        except (SyntaxError, ValueError):
+            raise Error('Syntax error on %s:%d before:\n%s' % (infile, lno, l))
         if section == CTXT:
             msgctxt += l.encode(encoding)
         elif section == ID:
@@ -197,32 +222,34 @@ def make(filename, outfile):
         elif section == STR:
             msgstr += l.encode(encoding)
         else:
-            print('Syntax error on %s:%d' % (infile, lno), \
-                  'before:', file=sys.stderr)
-            print(l, file=sys.stderr)
-            sys.exit(1)
+            raise Error('Syntax error on %s:%d before:\n%s' % (infile, lno, l))
     # Add last entry
     if section == STR:
-        add(msgctxt, msgid, msgstr, fuzzy)
+        add(messages, msgctxt, msgid, msgstr, fuzzy)
 
     # Compute output
-    output = generate()
+    output = generate(messages)
 
+    # Write to a temporary file first so that readers never see a partial file
     try:
-        with open(outfile,"wb") as f:
+        with open(outfile + ".tmp", "wb") as f:
             f.write(output)
+        os.replace(outfile + ".tmp", outfile)
     except IOError as msg:
-        print(msg, file=sys.stderr)
+        raise Error(msg)
 
 
 def main():
     try:
-        opts, args = getopt.getopt(sys.argv[1:], 'hVo:',
-                                   ['help', 'version', 'output-file='])
+        opts, args = getopt.getopt(sys.argv[1:], 'hVo:m:j:',
+                                   ['help', 'version', 'output-file=',
+                                    'manifest=', 'jobs='])
     except getopt.error as msg:
         usage(1, msg)
 
     outfile = None
+    manifest = None
+    jobs = None
     # parse options
     for opt, arg in opts:
         if opt in ('-h', '--help'):
@@ -232,14 +259,71 @@ def main():
             sys.exit(0)
         elif opt in ('-o', '--output-file'):
             outfile = arg
+        elif opt in ('-m', '--manifest'):
+            manifest = arg
+        elif opt in ('-j', '--jobs'):
+            jobs = int(arg)
     # do it
     if not args:
         print('No input file given', file=sys.stderr)
         print("Try `msgfmt --help' for more information.", file=sys.stderr)
         return
+    if outfile is not None and len(args) > 1:
+        usage(1, '--output-file is not allowed with multiple input files')
+
+    hashes = {}
+    if manifest is not None:
+        try:
+            with open(manifest, 'r') as f:
+                hashes = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    # Skip inputs whose hash is unchanged since their output was generated
+    tasks = []
+    try:
+        for filename in args:
+            infile, out = names(filename, outfile)
+            h = digest(infile)
+            if hashes.get(infile) == h and os.path.exists(out):
+                continue
+            tasks.append((filename, infile, h))
+    except Error as msg:
+        print(msg, file=sys.stderr)
+        sys.exit(1)
+
+    # Errors are raised in the workers and reported here, and only the
+    # inputs compiled successfully are recorded in the manifest
+    compiled = []
+    if len(tasks) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(make, filename, outfile) for filename, _, _ in tasks]
+            for task, future in zip(tasks, futures):
+                try:
+                    future.result()
+                except Error as msg:
+                    print(msg, file=sys.stderr)
+                else:
+                    compiled.append(task)
+    else:
+        for task in tasks:
+            try:
+                make(task[0], outfile)
+            except Error as msg:
+                print(msg, file=sys.stderr)
+            else:
+                compiled.append(task)
 
-    for filename in args:
-        make(filename, outfile)
+    if manifest is not None:
+        hashes.update({infile: h for _, infile, h in compiled})
+        with open(manifest + ".tmp", 'w') as f:
+            json.dump(hashes, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(manifest + ".tmp", manifest)
+
+    print(f'{len(compiled)} of {len(args)} files compiled', file=sys.stderr)
+    if len(compiled) < len(tasks):
+        sys.exit(1)
 
 
 if __name__ == '__main__':
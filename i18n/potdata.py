@@ -0,0 +1,184 @@
+#! /usr/bin/env python3
+
+"""Generate .pot files from the JSON records of compass data.
+
+For each domain (card, hero and stage), the translatable fields of every
+record in DATADIR/<domain>/*.json are extracted into <domain>.pot in one
+pass.  A message shared by several records is written once, with the IDs of
+all the records as references.
+
+Usage: potdata.py [OPTIONS] [datadir]
+
+    datadir defaults to compass/compass-data/data.
+
+Options:
+    -p dir
+    --output-dir=dir
+        Write the .pot files to this directory.  Defaults to compass/locale.
+
+    -m file
+    --manifest=file
+        Record the hash of the records of every domain in this JSON file,
+        and skip domains whose records are unchanged since the .pot file was
+        generated.
+
+    -h
+    --help
+        Print this message and exit.
+
+    -V
+    --version
+        Display version information and exit.
+"""
+
+import getopt
+import hashlib
+import json
+import os
+import sys
+import time
+from glob import glob
+
+from pygettext import make_escapes, normalize
+
+__version__ = "1.0"
+
+# domain: (field of the reference, translatable fields)
+DOMAINS = {
+    "card": ("num", ("name", "ability")),
+    "hero": ("num", ("name", "ultname", "ultinvincible", "ult",
+                     "haname", "ha", "abilityname", "ability")),
+    "stage": ("id", ("name", "description")),
+}
+
+pot_header = '''\
+# SOME DESCRIPTIVE TITLE.
+# Copyright (C) YEAR ORGANIZATION
+# FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.
+#
+msgid ""
+msgstr ""
+"Project-Id-Version: PACKAGE VERSION\\n"
+"POT-Creation-Date: %(time)s\\n"
+"PO-Revision-Date: YEAR-MO-DA HO:MI+ZONE\\n"
+"Last-Translator: FULL NAME <EMAIL@ADDRESS>\\n"
+"Language-Team: LANGUAGE <LL@li.org>\\n"
+"MIME-Version: 1.0\\n"
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Content-Transfer-Encoding: 8bit\\n"
+"Generated-By: potdata.py %(version)s\\n"
+'''
+
+
+def usage(code, msg=''):
+    print(__doc__, file=sys.stderr)
+    if msg:
+        print(msg, file=sys.stderr)
+    sys.exit(code)
+
+
+def read(datadir, domain):
+    "Return the contents of the records of the domain and their hash."
+    h = hashlib.sha256(__version__.encode() + b'\0')
+    records = []
+    for filename in sorted(glob(os.path.join(datadir, domain, "*.json"))):
+        with open(filename, 'rb') as f:
+            data = f.read()
+        h.update(os.path.basename(filename).encode() + b'\0')
+        h.update(data + b'\0')
+        records.append(data)
+    return records, h.hexdigest()
+
+
+def extract(domain, records):
+    "Return the messages of the records mapped to their references."
+    ref, fields = DOMAINS[domain]
+    # dicts keep the first occurrence of a message first
+    messages = {}
+    for data in records:
+        record = json.loads(data)
+        for field in fields:
+            msgid = record.get(field)
+            if msgid:
+                messages.setdefault(msgid, []).append(str(record[ref]))
+    return messages
+
+
+def write(messages, outfile, width=78):
+    "Write the messages to the .pot file."
+    lines = [pot_header % {'time': time.strftime('%Y-%m-%d %H:%M%z'),
+                           'version': __version__}]
+    for msgid, refs in messages.items():
+        # fit as many references on one line as the width allows
+        locline = '#:'
+        for ref in refs:
+            if len(locline) + len(ref) + 1 > width and len(locline) > 2:
+                lines.append(locline)
+                locline = '#:'
+            locline += ' ' + ref
+        lines.append(locline)
+        lines.append('msgid ' + normalize(msgid, 'UTF-8'))
+        lines.append('msgstr ""\n')
+
+    # Write to a temporary file first so that readers never see a partial file
+    with open(outfile + ".tmp", 'w', encoding='UTF-8') as f:
+        f.write('\n'.join(lines))
+    os.replace(outfile + ".tmp", outfile)
+
+
+def main():
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], 'hVp:m:',
+                                   ['help', 'version', 'output-dir=', 'manifest='])
+    except getopt.error as msg:
+        usage(1, msg)
+
+    outdir = "compass/locale"
+    manifest = None
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):
+            usage(0)
+        elif opt in ('-V', '--version'):
+            print("potdata.py", __version__)
+            sys.exit(0)
+        elif opt in ('-p', '--output-dir'):
+            outdir = arg
+        elif opt in ('-m', '--manifest'):
+            manifest = arg
+    if len(args) > 1:
+        usage(1, 'Only one data directory is allowed')
+    datadir = args[0] if args else "compass/compass-data/data"
+
+    hashes = {}
+    if manifest is not None:
+        try:
+            with open(manifest, 'r') as f:
+                hashes = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    make_escapes(True)
+    generated = 0
+    for domain in DOMAINS:
+        outfile = os.path.join(outdir, domain + ".pot")
+        records, h = read(datadir, domain)
+        if hashes.get(outfile) == h and os.path.exists(outfile):
+            continue
+        messages = extract(domain, records)
+        write(messages, outfile)
+        hashes[outfile] = h
+        generated += 1
+        print(f'{outfile}: {len(messages)} messages from {len(records)} records',
+              file=sys.stderr)
+
+    if manifest is not None:
+        with open(manifest + ".tmp", 'w') as f:
+            json.dump(hashes, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(manifest + ".tmp", manifest)
+
+    print(f'{generated} of {len(DOMAINS)} domains generated', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()